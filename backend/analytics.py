@@ -0,0 +1,223 @@
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from backend import crud
+from backend.config import get_settings
+
+
+class AnalyticsCounters:
+    """Dashboard counters seeded from the database once, then kept current from events.
+
+    Each group (e.g. "users_by_role") is loaded with one GROUP BY query on
+    first use and afterwards adjusted in place by apply(), which sees every
+    write event published on the event bus, including those from other
+    workers. Groups are reloaded after ``ttl`` seconds as a safety net
+    against any drift, e.g. a write that landed between a reload and its
+    event.
+    """
+
+    def __init__(self, loaders: dict, ttl: float, timer=time.monotonic):
+        self.loaders = loaders
+        self.ttl = ttl
+        self._timer = timer
+        self._counts = {}
+        self._loaded_at = {}
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.events_applied = 0
+
+    def get(self, db, group: str) -> dict:
+        with self._lock:
+            loaded_at = self._loaded_at.get(group)
+            if loaded_at is None or loaded_at + self.ttl <= self._timer():
+                self._counts[group] = dict(self.loaders[group](db))
+                self._loaded_at[group] = self._timer()
+                self.reloads += 1
+            return dict(self._counts[group])
+
+    def snapshot(self, db) -> dict:
+        return {group: self.get(db, group) for group in self.loaders}
+
+    def adjust(self, group: str, key: str, delta: int):
+        with self._lock:
+            counts = self._counts.get(group)
+            if counts is None:
+                # Not seeded yet; the first read loads it from the database
+                return
+            value = counts.get(key, 0) + delta
+            if value > 0:
+                counts[key] = value
+            else:
+                # GROUP BY never returns empty groups
+                counts.pop(key, None)
+
+    def invalidate(self, group: str):
+        with self._lock:
+            self._loaded_at.pop(group, None)
+
+    def apply(self, message: dict):
+        """Update counters from a broadcast write event."""
+        event_type = message.get("type")
+        data = message.get("data") or {}
+        if event_type == "user_created":
+            self.adjust("users_by_role", data["user"]["role"], 1)
+        elif event_type == "user_updated":
+            previous_role = data.get("previous_role")
+            if previous_role and previous_role != data["user"]["role"]:
+                self.adjust("users_by_role", previous_role, -1)
+                self.adjust("users_by_role", data["user"]["role"], 1)
+        elif event_type == "user_deleted":
+            if data.get("role"):
+                self.adjust("users_by_role", data["role"], -1)
+            if data.get("role") == "trainer":
+                # A trainer's sessions are deleted with them
+                self.invalidate("sessions_by_status")
+        elif event_type == "session_created":
+            self.adjust("sessions_by_status", data["status"], 1)
+        elif event_type == "session_updated":
+            previous_status = data.get("previous_status")
+            if previous_status and previous_status != data["status"]:
+                self.adjust("sessions_by_status", previous_status, -1)
+                self.adjust("sessions_by_status", data["status"], 1)
+        elif event_type == "session_deleted":
+            if data.get("status"):
+                self.adjust("sessions_by_status", data["status"], -1)
+        else:
+            return
+        self.events_applied += 1
+
+    def metrics(self):
+        return {"groups": sorted(self._counts), "reloads": self.reloads, "events_applied": self.events_applied}
+
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def bucket_start(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start: date, granularity: str) -> date:
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def buckets_back(day: date, granularity: str, count: int) -> date:
+    """Start of the bucket ``count`` buckets before the one containing ``day``."""
+    start = bucket_start(day, granularity)
+    for _ in range(count):
+        start = bucket_start(start - timedelta(days=1), granularity)
+    return start
+
+
+def _as_date(value) -> date:
+    # MySQL returns DATE objects or, for DATE_FORMAT, strings; SQLite strings
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _midnight(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day)
+
+
+class TimeseriesRollups:
+    """Day/week/month rollups of session and attendance metrics.
+
+    Values come from SQL GROUP BY date-bucket queries. Buckets that ended
+    more than ``settle_days`` ago are considered closed: computed once,
+    stored in analytics_rollups and read back from there afterwards. Only
+    the remaining recent buckets are recomputed per request. Late edits to
+    closed buckets need a rebuild (scripts/rebuild_analytics_rollups.py).
+    """
+
+    def __init__(self, metrics: dict, settle_days: int, max_buckets: int):
+        self.metrics = metrics
+        self.settle_days = settle_days
+        self.max_buckets = max_buckets
+
+    def buckets(self, start: date, end: date, granularity: str):
+        """Bucket starts covering [start, end], aligned to the granularity."""
+        buckets = []
+        current = bucket_start(start, granularity)
+        while current <= end:
+            buckets.append(current)
+            if len(buckets) > self.max_buckets:
+                raise ValueError(f"Range spans more than {self.max_buckets} {granularity} buckets")
+            current = next_bucket(current, granularity)
+        return buckets
+
+    def series(self, db, metric: str, granularity: str, start: date, end: date, today: date = None):
+        """Return ``[(bucket_start, {dimension: value})]`` for every bucket in range."""
+        if metric not in self.metrics:
+            raise ValueError(f"Unknown metric: {metric}")
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        buckets = self.buckets(start, end, granularity)
+        if not buckets:
+            return []
+        today = today or datetime.now(timezone.utc).date()
+        settled_before = today - timedelta(days=self.settle_days)
+        closed = [b for b in buckets if next_bucket(b, granularity) <= settled_before]
+        values = {b: {} for b in buckets}
+
+        stored = set()
+        if closed:
+            for row in crud.get_analytics_rollups(db, metric, granularity, closed[0], closed[-1]):
+                values[row.bucket_start][row.dimension] = row.value
+                stored.add(row.bucket_start)
+
+        missing = [b for b in closed if b not in stored]
+        if missing:
+            computed = self._compute(db, metric, granularity, missing[0], next_bucket(missing[-1], granularity))
+            to_save = {b: computed.get(b, {"total": 0}) for b in missing}
+            crud.save_analytics_rollups(db, metric, granularity, to_save)
+            values.update(to_save)
+
+        open_buckets = buckets[len(closed):]
+        if open_buckets:
+            computed = self._compute(db, metric, granularity, open_buckets[0], next_bucket(open_buckets[-1], granularity))
+            for b in open_buckets:
+                values[b] = computed.get(b, {"total": 0})
+
+        return [(b, values[b]) for b in buckets]
+
+    def _compute(self, db, metric: str, granularity: str, start: date, end: date) -> dict:
+        computed = {}
+        for bucket, dimension, value in self.metrics[metric](db, granularity, _midnight(start), _midnight(end)):
+            computed.setdefault(_as_date(bucket), {})[dimension] = value
+        for bucket_values in computed.values():
+            if "total" not in bucket_values:
+                bucket_values["total"] = sum(bucket_values.values())
+        return computed
+
+
+_settings = get_settings()
+
+timeseries_rollups = TimeseriesRollups(
+    metrics={
+        "sessions": crud.get_session_counts_by_bucket,
+        "training_minutes": crud.get_training_minutes_by_bucket,
+        "attendance": crud.get_attendance_counts_by_bucket,
+    },
+    settle_days=_settings.ANALYTICS_ROLLUP_SETTLE_DAYS,
+    max_buckets=_settings.ANALYTICS_TIMESERIES_MAX_BUCKETS,
+)
+
+analytics_counters = AnalyticsCounters(
+    loaders={
+        "users_by_role": crud.get_user_count_by_role,
+        "sessions_by_status": crud.get_session_count_by_status,
+    },
+    ttl=_settings.ANALYTICS_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,92 @@
+"""Trainees x sessions attendance grid for one trainer.
+
+The grid is a dense uint8 NumPy array holding one status code per cell;
+session and trainee ids are mapped to columns and rows with searchsorted,
+so filling it is a single vectorised assignment.
+"""
+
+import numpy as np
+
+from backend import crud
+
+NOT_ENROLLED, UNMARKED, ABSENT, PRESENT = 0, 1, 2, 3
+
+# One character per status code, indexed by code
+SYMBOLS = b"-.AP"
+LEGEND = {"-": "not_enrolled", ".": "unmarked", "A": "absent", "P": "present"}
+LABELS = ("", "Unmarked", "Absent", "Present")
+
+
+def _positions(ids, lookup):
+    """Index of each of ``lookup`` within ``ids`` (all must be present)."""
+    order = np.argsort(ids, kind="stable")
+    return order[np.searchsorted(ids, lookup, sorter=order)]
+
+
+class AttendanceMatrix:
+    """Rows are trainees (by name), columns are sessions (by scheduled date)."""
+
+    def __init__(self, sessions, trainees, cells):
+        self.sessions = sessions
+        self.trainees = trainees
+        self.session_ids = np.fromiter((s[0] for s in sessions), dtype=np.int64, count=len(sessions))
+        self.trainee_ids = np.fromiter((t[0] for t in trainees), dtype=np.int64, count=len(trainees))
+        cells = np.fromiter(
+            ((session_id, trainee_id, UNMARKED if present is None else PRESENT if present else ABSENT)
+             for session_id, trainee_id, present in cells),
+            dtype=[("session", np.int64), ("trainee", np.int64), ("code", np.uint8)],
+            count=len(cells),
+        )
+        self.grid = np.zeros((self.trainee_ids.size, self.session_ids.size), dtype=np.uint8)
+        if cells.size:
+            rows = _positions(self.trainee_ids, cells["trainee"])
+            columns = _positions(self.session_ids, cells["session"])
+            self.grid[rows, columns] = cells["code"]
+
+    @classmethod
+    def from_db(cls, db, trainer_id: int, date_from=None, date_to=None):
+        return cls(
+            crud.get_matrix_sessions(db, trainer_id, date_from, date_to),
+            crud.get_matrix_trainees(db, trainer_id, date_from, date_to),
+            crud.get_matrix_cells(db, trainer_id, date_from, date_to),
+        )
+
+    def attended(self):
+        return (self.grid == PRESENT).sum(axis=1)
+
+    def enrolled(self):
+        return (self.grid != NOT_ENROLLED).sum(axis=1)
+
+    def packed_rows(self):
+        """One string per trainee, one SYMBOLS character per session."""
+        if self.session_ids.size == 0:
+            return [""] * self.trainee_ids.size
+        characters = np.frombuffer(SYMBOLS, dtype=np.uint8)[self.grid]
+        return [row.decode("ascii") for row in np.ascontiguousarray(characters).view(f"S{self.session_ids.size}").ravel()]
+
+    def to_dict(self) -> dict:
+        return {
+            "sessions": [
+                {"id": session_id, "title": title, "scheduled_date": scheduled_date, "status": status.value}
+                for session_id, title, scheduled_date, status in self.sessions
+            ],
+            "trainees": [
+                {"id": trainee_id, "name": f"{first_name} {last_name}"}
+                for trainee_id, first_name, last_name in self.trainees
+            ],
+            "legend": LEGEND,
+            "rows": self.packed_rows(),
+        }
+
+    def table(self):
+        """Header plus one row per trainee with readable labels, for file exports."""
+        header = ["Trainee ID", "Trainee"] + [
+            f"{title} ({scheduled_date.strftime('%Y-%m-%d')})" for _, title, scheduled_date, _ in self.sessions
+        ] + ["Attended", "Enrolled"]
+        labels = np.array(LABELS, dtype=object)[self.grid]
+        rows = [
+            [trainee_id, f"{first_name} {last_name}", *labels[index].tolist(), int(attended), int(enrolled)]
+            for index, ((trainee_id, first_name, last_name), attended, enrolled)
+            in enumerate(zip(self.trainees, self.attended(), self.enrolled()))
+        ]
+        return header, rows
@@ -0,0 +1,145 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from backend.config import get_settings
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, maxsize: int, ttl: float, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= self._timer():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (self._timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def discard_where(self, predicate):
+        """Remove every entry whose (key, value) matches predicate."""
+        with self._lock:
+            stale = [key for key, (_, value) in self._data.items() if predicate(key, value)]
+            for key in stale:
+                del self._data[key]
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def metrics(self):
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+class PrincipalCache(TTLCache):
+    """Authenticated users keyed by (username, token).
+
+    Cached users are detached from their DB session, so only column
+    attributes (id, role, username, ...) are safe to read from them.
+    """
+
+    def invalidate_user(self, user_id: int):
+        return self.discard_where(lambda key, user: user.id == user_id)
+
+
+class EntityCache(TTLCache):
+    """Validated single-entity responses keyed by ("user" | "session", id).
+
+    Entries are dropped when a write event names the entity; see
+    invalidate_cached_entities in backend/main.py.
+    """
+
+    def invalidate(self, kind: str, entity_id: int):
+        self.pop((kind, entity_id))
+
+    def invalidate_sessions_of_user(self, user_id: int):
+        """Drop cached sessions that embed or are run by this user."""
+        return self.discard_where(
+            lambda key, session: key[0] == "session" and (
+                session.trainer_id == user_id or any(t.id == user_id for t in session.trainees)
+            )
+        )
+
+
+class TableVersions:
+    """In-process change counters per table, bumped by the crud write functions.
+
+    Used to build cheap HTTP validators. ``epoch`` is random per process, so
+    ETags issued by different uvicorn workers never match each other. Writes
+    made by other workers arrive as bus events; see TABLES_BY_EVENT in
+    backend/main.py.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions = {}
+        self._modified = {}
+        self._started = datetime.now(timezone.utc)
+        self._lock = threading.Lock()
+
+    def bump(self, *tables: str):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+                self._modified[table] = now
+
+    def version(self, *tables: str) -> str:
+        return ".".join(str(self._versions.get(table, 0)) for table in tables)
+
+    def last_modified(self, *tables: str) -> datetime:
+        return max((self._modified.get(table, self._started) for table in tables), default=self._started)
+
+    def etag(self, scope: str, *tables: str) -> str:
+        digest = hashlib.sha1(scope.encode("utf-8")).hexdigest()[:16]
+        return f'W/"{self.epoch}-{self.version(*tables)}-{digest}"'
+
+
+_settings = get_settings()
+
+principal_cache = PrincipalCache(
+    maxsize=_settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=_settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+entity_cache = EntityCache(
+    maxsize=_settings.ENTITY_CACHE_MAX_ENTRIES,
+    ttl=_settings.ENTITY_CACHE_TTL_SECONDS,
+)
+
+table_versions = TableVersions()
@@ -0,0 +1,173 @@
+"""Cohort analytics over attendance, computed on NumPy column arrays.
+
+The tables are bulk-loaded once as flat arrays (one value per row), and
+every statistic is then a handful of vectorised operations: bincount for
+per-trainee counts, lexsort for per-group percentiles and cumulative
+bincounts for retention. Nothing loops over trainees in Python.
+
+Attendance rates follow crud.get_trainee_progress: present attendance
+records over enrolled sessions, as a percentage.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from backend import crud
+
+PERCENTILES = (10, 25, 50, 75, 90)
+WEEK_SECONDS = 7 * 24 * 3600
+
+
+def _epoch(value) -> float:
+    if value is None:
+        return np.nan
+    if value.tzinfo is None:
+        # Stored in UTC; MySQL returns naive datetimes
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class CohortArrays:
+    """The columns cohort statistics need, one NumPy array per column.
+
+    Times are UTC epoch seconds (float64).
+    """
+
+    def __init__(self, enrolled_trainee, attendance_trainee, attendance_present, attendance_time,
+                 assigned_trainee, assigned_trainer, assigned_time):
+        self.enrolled_trainee = np.asarray(enrolled_trainee, dtype=np.int64)
+        self.attendance_trainee = np.asarray(attendance_trainee, dtype=np.int64)
+        self.attendance_present = np.asarray(attendance_present, dtype=bool)
+        self.attendance_time = np.asarray(attendance_time, dtype=np.float64)
+        self.assigned_trainee = np.asarray(assigned_trainee, dtype=np.int64)
+        self.assigned_trainer = np.asarray(assigned_trainer, dtype=np.int64)
+        self.assigned_time = np.asarray(assigned_time, dtype=np.float64)
+        # Trainee ids index the per-trainee arrays directly
+        self.id_space = 1 + max(
+            (int(a.max()) for a in (self.enrolled_trainee, self.attendance_trainee, self.assigned_trainee) if a.size),
+            default=0
+        )
+
+    @classmethod
+    def from_db(cls, db, batch_size: int = 10000):
+        enrolled = np.fromiter(crud.stream_enrolment_columns(db, batch_size), dtype=np.int64)
+        attendance = np.fromiter(
+            ((trainee_id, present, _epoch(scheduled)) for trainee_id, present, scheduled in crud.stream_attendance_columns(db, batch_size)),
+            dtype=[("trainee", np.int64), ("present", bool), ("time", np.float64)]
+        )
+        assignments = np.fromiter(
+            ((student_id, teacher_id, _epoch(assigned)) for student_id, teacher_id, assigned in crud.stream_assignment_columns(db, batch_size)),
+            dtype=[("trainee", np.int64), ("trainer", np.int64), ("time", np.float64)]
+        )
+        return cls(
+            enrolled,
+            attendance["trainee"], attendance["present"], attendance["time"],
+            assignments["trainee"], assignments["trainer"], assignments["time"],
+        )
+
+
+def attendance_rates(data: CohortArrays):
+    """Return (trainee_ids, rates) for every trainee enrolled in any session."""
+    enrolled = np.bincount(data.enrolled_trainee, minlength=data.id_space)
+    present = np.bincount(data.attendance_trainee[data.attendance_present], minlength=data.id_space)
+    trainee_ids = np.flatnonzero(enrolled)
+    rates = present[trainee_ids] / enrolled[trainee_ids] * 100
+    return trainee_ids, rates
+
+
+def summarize(values) -> dict:
+    if values.size == 0:
+        return {"count": 0, "mean": None, **{f"p{q}": None for q in PERCENTILES}}
+    quantiles = np.percentile(values, PERCENTILES)
+    return {
+        "count": int(values.size),
+        "mean": round(float(values.mean()), 2),
+        **{f"p{q}": round(float(v), 2) for q, v in zip(PERCENTILES, quantiles)},
+    }
+
+
+def grouped_percentiles(groups, values, percentiles=PERCENTILES):
+    """Per-group count, mean and percentiles (linear interpolation) in one pass.
+
+    Returns (group_ids, counts, means, quantiles) where quantiles has one
+    column per requested percentile.
+    """
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    group_ids, starts, counts = np.unique(groups, return_index=True, return_counts=True)
+    means = np.add.reduceat(values, starts) / counts if values.size else np.empty(0)
+    positions = starts[:, None] + (counts[:, None] - 1) * (np.asarray(percentiles) / 100)[None, :]
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    quantiles = values[lower] + (values[upper] - values[lower]) * (positions - lower)
+    return group_ids, counts, means, quantiles
+
+
+def trainer_distributions(data: CohortArrays, trainee_ids, rates):
+    """Attendance-rate distribution of each trainer's assigned trainees."""
+    rate_by_trainee = np.full(data.id_space, np.nan)
+    rate_by_trainee[trainee_ids] = rates
+    pair_rates = rate_by_trainee[data.assigned_trainee]
+    known = ~np.isnan(pair_rates)
+    trainer_ids, counts, means, quantiles = grouped_percentiles(data.assigned_trainer[known], pair_rates[known])
+    return [
+        {
+            "trainer_id": int(trainer_id),
+            "trainees": int(count),
+            "mean": round(float(mean), 2),
+            **{f"p{q}": round(float(v), 2) for q, v in zip(PERCENTILES, row)},
+        }
+        for trainer_id, count, mean, row in zip(trainer_ids, counts, means, quantiles)
+    ]
+
+
+def _at_least(weeks_values, max_weeks: int):
+    """counts[n] = number of values >= n, for n in 0..max_weeks (negatives ignored)."""
+    kept = weeks_values[weeks_values >= 0]
+    counts = np.bincount(np.minimum(kept, max_weeks), minlength=max_weeks + 1)
+    return counts[::-1].cumsum()[::-1]
+
+
+def retention_curve(data: CohortArrays, max_weeks: int, now: float = None):
+    """Share of assigned trainees still attending N weeks after their first assignment.
+
+    A trainee counts as retained at week N if they have a present attendance
+    for a session at least N weeks after assignment. Only trainees assigned
+    at least N weeks ago are eligible for week N.
+    """
+    now = datetime.now(timezone.utc).timestamp() if now is None else now
+    first_assigned = np.full(data.id_space, np.inf)
+    np.minimum.at(first_assigned, data.assigned_trainee, data.assigned_time)
+    last_present = np.full(data.id_space, -np.inf)
+    present = data.attendance_present & ~np.isnan(data.attendance_time)
+    np.maximum.at(last_present, data.attendance_trainee[present], data.attendance_time[present])
+
+    cohort = np.flatnonzero(np.isfinite(first_assigned))
+    start = first_assigned[cohort]
+    age_weeks = np.floor((now - start) / WEEK_SECONDS).astype(np.int64)
+    span = last_present[cohort] - start
+    retained_weeks = np.full(cohort.size, -1, dtype=np.int64)
+    attending = span >= 0
+    retained_weeks[attending] = np.floor(span[attending] / WEEK_SECONDS)
+
+    eligible = _at_least(age_weeks, max_weeks)
+    retained = _at_least(np.minimum(retained_weeks, age_weeks), max_weeks)
+    return [
+        {
+            "week": week,
+            "eligible": int(eligible[week]),
+            "retained": int(retained[week]),
+            "share": round(float(retained[week] / eligible[week] * 100), 2) if eligible[week] else None,
+        }
+        for week in range(max_weeks + 1)
+    ]
+
+
+def cohort_report(data: CohortArrays, retention_weeks: int = 12, now: float = None) -> dict:
+    trainee_ids, rates = attendance_rates(data)
+    return {
+        "attendance_rate": summarize(rates),
+        "trainers": trainer_distributions(data, trainee_ids, rates),
+        "retention": retention_curve(data, retention_weeks, now),
+    }
@@ -21,6 +21,41 @@ class Settings(BaseSettings):
     API_V1_STR: str = ""
     PROJECT_NAME: str = "Training Management System"
 
+    # Principal cache (authenticated user lookups in get_current_user)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 1024
+
+    # Single-entity response cache (GET /users/{id}, GET /sessions/{id})
+    ENTITY_CACHE_TTL_SECONDS: int = 30
+    ENTITY_CACHE_MAX_ENTRIES: int = 2048
+
+    # Dashboard counters: event-maintained, fully reloaded at least this often
+    ANALYTICS_CACHE_TTL_SECONDS: int = 300
+
+    # Time-series rollups: buckets that ended this many days ago are treated
+    # as closed and persisted; newer ones are recomputed on every request
+    ANALYTICS_ROLLUP_SETTLE_DAYS: int = 7
+    ANALYTICS_TIMESERIES_MAX_BUCKETS: int = 366
+
+    # Password hashing executor
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # WebSocket fan-out: per-connection outbound queue length and what to do
+    # when it is full ("drop_oldest" or "disconnect")
+    WS_SEND_QUEUE_SIZE: int = 100
+    WS_SLOW_CONSUMER_POLICY: str = "drop_oldest"
+    # Recent events kept for /ws?since=<stream>:<seq> replay after a reconnect
+    WS_REPLAY_BUFFER_SIZE: int = 1000
+
+    # Cross-worker event bus. Empty keeps events in-process (workers=1);
+    # a redis:// URL relays them between uvicorn workers.
+    EVENT_BUS_URL: str = ""
+    EVENT_BUS_CHANNEL: str = "training-events"
+
+    # Rows fetched per server-side cursor batch in NDJSON exports
+    EXPORT_BATCH_SIZE: int = 1000
+
     class Config:
         case_sensitive = True
 
@@ -1,6 +1,8 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from passlib.context import CryptContext
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import Integer, String, and_, case, cast, func, literal, or_, select
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import IntegrityError
+from collections import Counter
 from typing import List, Optional
 from datetime import datetime, timezone
 import secrets
@@ -10,8 +12,8 @@ import uuid
 
 from database import models
 from backend import schemas
-
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+from backend.cache import principal_cache, table_versions
+from backend.hashing import password_hasher
 
 # User CRUD operations
 def get_user(db: Session, user_id: int):
@@ -23,8 +25,12 @@ def get_user_by_username(db: Session, username: str):
 def get_user_by_email(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.User).offset(skip).limit(limit).all()
+def get_users(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    query = db.query(models.User).order_by(models.User.id)
+    if after_id is not None:
+        # Keyset pagination: seek past the cursor instead of scanning skip rows
+        return query.filter(models.User.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
 
 def get_users_by_role(db: Session, role: models.UserRole):
     return db.query(models.User).filter(models.User.role == role).all()
@@ -37,7 +43,16 @@ def generate_temporary_password(length: int = 12):
 def create_user(db: Session, user: schemas.UserCreate):
     # Generate a random temporary password
     temporary_password = generate_temporary_password()
-    hashed_password = pwd_context.hash(temporary_password)
+    hashed_password = password_hasher.hash_blocking(temporary_password)
+    # Return both the user and the plain text temporary password for secure sharing
+    return _save_new_user(db, user, hashed_password), temporary_password
+
+async def create_user_async(db: Session, user: schemas.UserCreate):
+    temporary_password = generate_temporary_password()
+    hashed_password = await password_hasher.hash(temporary_password)
+    return _save_new_user(db, user, hashed_password), temporary_password
+
+def _save_new_user(db: Session, user: schemas.UserCreate, hashed_password: str):
     db_user = models.User(
         username=user.username,
         email=user.email,
@@ -50,17 +65,25 @@ def create_user(db: Session, user: schemas.UserCreate):
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
-    # Return both the user and the plain text temporary password for secure sharing
-    return db_user, temporary_password
+    table_versions.bump("users")
+    return db_user
 
 def update_user(db: Session, user_id: int, user_update: schemas.UserUpdate):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not db_user:
-        return None
+    update_data = user_update.dict(exclude_unset=True)
+    if "password" in update_data:
+        update_data["password_hash"] = password_hasher.hash_blocking(update_data.pop("password"))
+    return _apply_user_update(db, user_id, update_data)
 
+async def update_user_async(db: Session, user_id: int, user_update: schemas.UserUpdate):
     update_data = user_update.dict(exclude_unset=True)
     if "password" in update_data:
-        update_data["password_hash"] = pwd_context.hash(update_data.pop("password"))
+        update_data["password_hash"] = await password_hasher.hash(update_data.pop("password"))
+    return _apply_user_update(db, user_id, update_data)
+
+def _apply_user_update(db: Session, user_id: int, update_data: dict):
+    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+    if not db_user:
+        return None
 
     for field, value in update_data.items():
         setattr(db_user, field, value)
@@ -68,6 +91,8 @@ def update_user(db: Session, user_id: int, user_update: schemas.UserUpdate):
     db_user.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(db_user)
+    principal_cache.invalidate_user(user_id)
+    table_versions.bump("users")
     return db_user
 
 def delete_user(db: Session, user_id: int):
@@ -82,34 +107,62 @@ def delete_user(db: Session, user_id: int):
         db.query(models.AssignedStudent).filter(
             (models.AssignedStudent.student_id == user_id) | (models.AssignedStudent.teacher_id == user_id)
         ).delete()
+        # Trainees of the sessions removed below need their progress recounted
+        affected_trainees = [trainee_id for (trainee_id,) in db.query(models.SessionTrainee.trainee_id).join(
+            models.Session, models.Session.id == models.SessionTrainee.session_id
+        ).filter(models.Session.trainer_id == user_id).distinct()]
         # Delete SessionTrainee records
         db.query(models.SessionTrainee).filter(models.SessionTrainee.trainee_id == user_id).delete()
         # Delete Session records where user is trainer
         db.query(models.Session).filter(models.Session.trainer_id == user_id).delete()
+        db.query(models.TraineeProgress).filter(models.TraineeProgress.trainee_id == user_id).delete()
         # Now delete the user
         db.delete(db_user)
+        db.flush()
+        refresh_trainee_progress(db, [t for t in affected_trainees if t != user_id])
         db.commit()
+        principal_cache.invalidate_user(user_id)
+        table_versions.bump("users", "sessions", "assignments", "attendance")
         return True
     return False
 
-def authenticate_user(db: Session, username: str, password: str):
+def _find_login_user(db: Session, username: str):
     # Try to find user by username first
     user = get_user_by_username(db, username)
     if not user:
         # If not found by username, try by email
         user = get_user_by_email(db, username)
+    return user
+
+def authenticate_user(db: Session, username: str, password: str):
+    user = _find_login_user(db, username)
+    if not user:
+        return False
+    if not password_hasher.verify_blocking(password, user.password_hash):
+        return False
+    return user
+
+async def authenticate_user_async(db: Session, username: str, password: str):
+    user = _find_login_user(db, username)
     if not user:
         return False
-    if not pwd_context.verify(password, user.password_hash):
+    if not await password_hasher.verify(password, user.password_hash):
         return False
     return user
 
 def change_password(db: Session, user_id: int, new_password: str, performed_by: int = None):
+    hashed_password = password_hasher.hash_blocking(new_password)
+    return _save_changed_password(db, user_id, hashed_password, performed_by)
+
+async def change_password_async(db: Session, user_id: int, new_password: str, performed_by: int = None):
+    hashed_password = await password_hasher.hash(new_password)
+    return _save_changed_password(db, user_id, hashed_password, performed_by)
+
+def _save_changed_password(db: Session, user_id: int, hashed_password: str, performed_by: int = None):
     db_user = db.query(models.User).filter(models.User.id == user_id).first()
     if not db_user:
         return None
 
-    hashed_password = pwd_context.hash(new_password)
     db_user.password_hash = hashed_password
     db_user.is_temporary_password = False
     db_user.updated_at = datetime.utcnow()
@@ -125,14 +178,23 @@ def change_password(db: Session, user_id: int, new_password: str, performed_by:
 
     db.commit()
     db.refresh(db_user)
+    principal_cache.invalidate_user(user_id)
+    table_versions.bump("users")
     return db_user
 
 def reset_password(db: Session, user_id: int, new_password: str, performed_by: int):
+    hashed_password = password_hasher.hash_blocking(new_password)
+    return _save_reset_password(db, user_id, hashed_password, performed_by)
+
+async def reset_password_async(db: Session, user_id: int, new_password: str, performed_by: int):
+    hashed_password = await password_hasher.hash(new_password)
+    return _save_reset_password(db, user_id, hashed_password, performed_by)
+
+def _save_reset_password(db: Session, user_id: int, hashed_password: str, performed_by: int):
     db_user = db.query(models.User).filter(models.User.id == user_id).first()
     if not db_user:
         return None
 
-    hashed_password = pwd_context.hash(new_password)
     db_user.password_hash = hashed_password
     db_user.is_temporary_password = True
     db_user.updated_at = datetime.utcnow()
@@ -148,6 +210,8 @@ def reset_password(db: Session, user_id: int, new_password: str, performed_by: i
 
     db.commit()
     db.refresh(db_user)
+    principal_cache.invalidate_user(user_id)
+    table_versions.bump("users")
     return db_user
 
 def log_user_creation(db: Session, user_id: int, performed_by: int):
@@ -164,9 +228,78 @@ def log_user_creation(db: Session, user_id: int, performed_by: int):
 def get_session(db: Session, session_id: int):
     return db.query(models.Session).filter(models.Session.id == session_id).first()
 
+def get_session_with_trainees(db: Session, session_id: int):
+    return db.query(models.Session).options(
+        selectinload(models.Session.trainees).selectinload(models.SessionTrainee.trainee)
+    ).filter(models.Session.id == session_id).first()
+
 def get_sessions(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Session).offset(skip).limit(limit).all()
 
+SESSION_SORTS = ("id", "scheduled_date", "-scheduled_date")
+
+def get_sessions_for_user(db: Session, user: models.User, skip: int = 0, limit: int = 100,
+                          after: Optional[dict] = None, date_from: Optional[datetime] = None,
+                          date_to: Optional[datetime] = None, status: Optional[models.SessionStatus] = None,
+                          trainer_id: Optional[int] = None, trainee_id: Optional[int] = None,
+                          sort: str = "id"):
+    """Page of sessions visible to ``user``, with trainees eager-loaded.
+
+    Admins see every session, trainers the sessions they run and trainees
+    the sessions they are enrolled in. Scoping and filtering happen in SQL
+    so LIMIT applies to the visible rows; the whole page costs three queries.
+
+    ``sort`` is one of SESSION_SORTS. Pass ``after`` (a decoded cursor
+    holding the last row's id, plus scheduled_date when sorting by date)
+    instead of ``skip`` for keyset paging.
+    """
+    query = db.query(models.Session).options(
+        selectinload(models.Session.trainees).selectinload(models.SessionTrainee.trainee)
+    )
+    role = user.role.value
+    if role == "trainer":
+        query = query.filter(models.Session.trainer_id == user.id)
+    elif role == "trainee":
+        query = query.join(models.SessionTrainee).filter(models.SessionTrainee.trainee_id == user.id)
+    elif role != "admin":
+        return []
+
+    if date_from is not None:
+        query = query.filter(models.Session.scheduled_date >= date_from)
+    if date_to is not None:
+        query = query.filter(models.Session.scheduled_date < date_to)
+    if status is not None:
+        query = query.filter(models.Session.status == status)
+    if trainer_id is not None:
+        query = query.filter(models.Session.trainer_id == trainer_id)
+    if trainee_id is not None:
+        enrolled = db.query(models.SessionTrainee.session_id).filter(models.SessionTrainee.trainee_id == trainee_id)
+        query = query.filter(models.Session.id.in_(enrolled))
+
+    scheduled_date, session_id = models.Session.scheduled_date, models.Session.id
+    if sort == "scheduled_date":
+        query = query.order_by(scheduled_date, session_id)
+        if after is not None:
+            query = query.filter(or_(
+                scheduled_date > after["scheduled_date"],
+                and_(scheduled_date == after["scheduled_date"], session_id > after["id"])
+            ))
+    elif sort == "-scheduled_date":
+        query = query.order_by(scheduled_date.desc(), session_id.desc())
+        if after is not None:
+            query = query.filter(or_(
+                scheduled_date < after["scheduled_date"],
+                and_(scheduled_date == after["scheduled_date"], session_id < after["id"])
+            ))
+    else:
+        query = query.order_by(session_id)
+        if after is not None:
+            query = query.filter(session_id > after["id"])
+
+    if after is not None:
+        return query.limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
 def get_sessions_by_trainer(db: Session, trainer_id: int):
     return db.query(models.Session).filter(models.Session.trainer_id == trainer_id).all()
 
@@ -209,7 +342,9 @@ def create_session(db: Session, session: schemas.SessionCreate):
     for trainee_id in trainees:
         session_trainee = models.SessionTrainee(session_id=db_session.id, trainee_id=trainee_id)
         db.add(session_trainee)
+    adjust_trainee_progress(db, {trainee_id: (count, 0) for trainee_id, count in Counter(trainees).items()})
     db.commit()
+    table_versions.bump("sessions")
 
     return db_session
 
@@ -225,6 +360,14 @@ def update_session(db: Session, session_id: int, session_update: schemas.Session
         setattr(db_session, field, value)
 
     if trainees is not None:
+        previous = Counter(trainee_id for (trainee_id,) in db.query(models.SessionTrainee.trainee_id).filter(
+            models.SessionTrainee.session_id == session_id
+        ))
+        current = Counter(trainees)
+        adjust_trainee_progress(db, {
+            trainee_id: (current[trainee_id] - previous[trainee_id], 0)
+            for trainee_id in previous.keys() | current.keys()
+        })
         # Remove existing trainees
         db.query(models.SessionTrainee).filter(models.SessionTrainee.session_id == session_id).delete()
         # Add new trainees
@@ -235,8 +378,15 @@ def update_session(db: Session, session_id: int, session_update: schemas.Session
     db_session.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(db_session)
+    table_versions.bump("sessions")
     return db_session
 
+def _touch_session(db: Session, session_id: int):
+    """Bump sessions.updated_at for roster changes, so ``since`` exports pick them up."""
+    db.query(models.Session).filter(models.Session.id == session_id).update(
+        {"updated_at": datetime.now(timezone.utc)}, synchronize_session=False
+    )
+
 def add_trainee_to_session(db: Session, session_id: int, trainee_id: int):
     # Check if already added
     existing = db.query(models.SessionTrainee).filter(
@@ -248,8 +398,11 @@ def add_trainee_to_session(db: Session, session_id: int, trainee_id: int):
 
     session_trainee = models.SessionTrainee(session_id=session_id, trainee_id=trainee_id)
     db.add(session_trainee)
+    adjust_trainee_progress(db, {trainee_id: (1, 0)})
+    _touch_session(db, session_id)
     db.commit()
     db.refresh(session_trainee)
+    table_versions.bump("sessions")
     return session_trainee
 
 def remove_trainee_from_session(db: Session, session_id: int, trainee_id: int):
@@ -259,7 +412,10 @@ def remove_trainee_from_session(db: Session, session_id: int, trainee_id: int):
     ).first()
     if session_trainee:
         db.delete(session_trainee)
+        adjust_trainee_progress(db, {trainee_id: (-1, 0)})
+        _touch_session(db, session_id)
         db.commit()
+        table_versions.bump("sessions")
         return True
     return False
 
@@ -269,13 +425,63 @@ def get_session_trainees(db: Session, session_id: int):
 def delete_session(db: Session, session_id: int):
     db_session = db.query(models.Session).filter(models.Session.id == session_id).first()
     if db_session:
+        affected_trainees = {trainee_id for (trainee_id,) in db.query(models.SessionTrainee.trainee_id).filter(
+            models.SessionTrainee.session_id == session_id
+        )} | {trainee_id for (trainee_id,) in db.query(models.Attendance.trainee_id).filter(
+            models.Attendance.session_id == session_id
+        )}
         # Delete associated trainees
         db.query(models.SessionTrainee).filter(models.SessionTrainee.session_id == session_id).delete()
         db.delete(db_session)
+        db.flush()
+        refresh_trainee_progress(db, affected_trainees)
         db.commit()
+        table_versions.bump("sessions", "attendance")
         return True
     return False
 
+# Streaming exports. These fetch in batches of ``batch_size`` (through a
+# server-side cursor, or keyset pages for sessions) rather than materialising every row.
+# Rows are ordered by their change timestamp so ``since`` can be resumed.
+def stream_users(db: Session, since: Optional[datetime] = None, batch_size: int = 1000):
+    query = db.query(models.User)
+    if since is not None:
+        query = query.filter(models.User.updated_at >= since)
+    return query.order_by(models.User.updated_at, models.User.id).yield_per(batch_size)
+
+def stream_sessions(db: Session, since: Optional[datetime] = None, batch_size: int = 1000):
+    """Sessions with their enrolments, in keyset batches of ``batch_size``.
+
+    Unlike the other streams this keeps no cursor open: the selectin load of
+    each batch's trainees would run on the same connection, which pymysql
+    only allows by discarding the rest of an unbuffered result.
+    """
+    query = db.query(models.Session).options(selectinload(models.Session.trainees))
+    if since is not None:
+        query = query.filter(models.Session.updated_at >= since)
+    query = query.order_by(models.Session.updated_at, models.Session.id)
+    after = None
+    while True:
+        batch_query = query
+        if after is not None:
+            batch_query = batch_query.filter(or_(
+                models.Session.updated_at > after[0],
+                and_(models.Session.updated_at == after[0], models.Session.id > after[1])
+            ))
+        batch = batch_query.limit(batch_size).all()
+        yield from batch
+        if len(batch) < batch_size:
+            return
+        after = (batch[-1].updated_at, batch[-1].id)
+        # Exported rows are not needed again; keep the identity map small
+        db.expunge_all()
+
+def stream_attendance(db: Session, since: Optional[datetime] = None, batch_size: int = 1000):
+    query = db.query(models.Attendance)
+    if since is not None:
+        query = query.filter(models.Attendance.marked_at >= since)
+    return query.order_by(models.Attendance.marked_at, models.Attendance.id).yield_per(batch_size)
+
 # Analytics helper functions
 def get_user_count_by_role(db: Session):
     from sqlalchemy import func
@@ -286,8 +492,187 @@ def get_session_count_by_status(db: Session):
     from sqlalchemy import func
     result = db.query(models.Session.status, func.count(models.Session.id)).group_by(models.Session.status).all()
     return {status.value: count for status, count in result}
-def get_assigned_students(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.AssignedStudent).offset(skip).limit(limit).all()
+# Time-bucketed aggregates for backend.analytics rollups. Each returns
+# (bucket_start, dimension, value) rows for rows in [start, end).
+def date_bucket(db: Session, column, granularity: str):
+    """SQL expression truncating a datetime column to its day/week/month start.
+
+    Weeks start on Monday. MySQL returns DATE values, SQLite ISO strings.
+    """
+    if db.get_bind().dialect.name == "mysql":
+        if granularity == "day":
+            return func.date(column)
+        if granularity == "week":
+            return func.subdate(func.date(column), func.weekday(column))
+        return func.date_format(column, "%Y-%m-01")
+    if granularity == "day":
+        return func.date(column)
+    if granularity == "week":
+        weekday = (cast(func.strftime("%w", column), Integer) + 6) % 7
+        return func.date(column, literal("-", String) + cast(weekday, String) + literal(" days", String))
+    return func.date(column, "start of month")
+
+def get_session_counts_by_bucket(db: Session, granularity: str, start: datetime, end: datetime):
+    bucket = date_bucket(db, models.Session.scheduled_date, granularity)
+    return [(b, status.value, count) for b, status, count in db.query(
+        bucket, models.Session.status, func.count(models.Session.id)
+    ).filter(
+        models.Session.scheduled_date >= start,
+        models.Session.scheduled_date < end
+    ).group_by(bucket, models.Session.status)]
+
+def get_training_minutes_by_bucket(db: Session, granularity: str, start: datetime, end: datetime):
+    """Scheduled minutes per trainer; cancelled sessions are excluded."""
+    bucket = date_bucket(db, models.Session.scheduled_date, granularity)
+    return [(b, str(trainer_id), int(minutes or 0)) for b, trainer_id, minutes in db.query(
+        bucket, models.Session.trainer_id, func.sum(models.Session.duration_minutes)
+    ).filter(
+        models.Session.scheduled_date >= start,
+        models.Session.scheduled_date < end,
+        models.Session.status != models.SessionStatus.cancelled
+    ).group_by(bucket, models.Session.trainer_id)]
+
+def get_attendance_counts_by_bucket(db: Session, granularity: str, start: datetime, end: datetime):
+    """Marked ("total") and present attendance records by marked_at."""
+    bucket = date_bucket(db, models.Attendance.marked_at, granularity)
+    rows = []
+    for b, marked, present in db.query(
+        bucket,
+        func.count(models.Attendance.id),
+        func.sum(case((models.Attendance.present == True, 1), else_=0))
+    ).filter(
+        models.Attendance.marked_at >= start,
+        models.Attendance.marked_at < end
+    ).group_by(bucket):
+        rows.append((b, "total", marked))
+        rows.append((b, "present", int(present or 0)))
+    return rows
+
+# Column streams for backend.cohorts. Plain tuples fetched in batches through
+# a server-side cursor; no ORM objects are built.
+def stream_enrolment_columns(db: Session, batch_size: int = 10000):
+    """trainee_id of every session_trainees row."""
+    return db.execute(
+        select(models.SessionTrainee.trainee_id).execution_options(yield_per=batch_size)
+    ).scalars()
+
+def stream_attendance_columns(db: Session, batch_size: int = 10000):
+    """(trainee_id, present, session scheduled_date) of every attendance row."""
+    return db.execute(
+        select(models.Attendance.trainee_id, models.Attendance.present, models.Session.scheduled_date).join(
+            models.Session, models.Session.id == models.Attendance.session_id
+        ).execution_options(yield_per=batch_size)
+    )
+
+def stream_assignment_columns(db: Session, batch_size: int = 10000):
+    """(student_id, teacher_id, assigned_date) of every assignment."""
+    return db.execute(
+        select(
+            models.AssignedStudent.student_id,
+            models.AssignedStudent.teacher_id,
+            models.AssignedStudent.assigned_date
+        ).execution_options(yield_per=batch_size)
+    )
+
+# Attendance matrix (backend.attendance_matrix): a trainer's sessions,
+# enrolled trainees and per-enrolment attendance as three flat queries.
+# The date window is half-open, [date_from, date_to), as for /sessions/
+def _trainer_sessions_filter(trainer_id: int, date_from: Optional[datetime], date_to: Optional[datetime]):
+    conditions = [models.Session.trainer_id == trainer_id]
+    if date_from is not None:
+        conditions.append(models.Session.scheduled_date >= date_from)
+    if date_to is not None:
+        conditions.append(models.Session.scheduled_date < date_to)
+    return and_(*conditions)
+
+def get_matrix_sessions(db: Session, trainer_id: int, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None):
+    """(id, title, scheduled_date, status) of the trainer's sessions, in date order."""
+    return db.query(
+        models.Session.id, models.Session.title, models.Session.scheduled_date, models.Session.status
+    ).filter(
+        _trainer_sessions_filter(trainer_id, date_from, date_to)
+    ).order_by(models.Session.scheduled_date, models.Session.id).all()
+
+def get_matrix_trainees(db: Session, trainer_id: int, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None):
+    """(id, first_name, last_name) of trainees enrolled in any of those sessions, by name."""
+    enrolled = db.query(models.SessionTrainee.trainee_id).join(
+        models.Session, models.Session.id == models.SessionTrainee.session_id
+    ).filter(_trainer_sessions_filter(trainer_id, date_from, date_to))
+    return db.query(
+        models.User.id, models.User.first_name, models.User.last_name
+    ).filter(
+        models.User.id.in_(enrolled)
+    ).order_by(models.User.last_name, models.User.first_name, models.User.id).all()
+
+def get_matrix_cells(db: Session, trainer_id: int, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None):
+    """(session_id, trainee_id, present or None if unmarked) for every enrolment."""
+    return db.query(
+        models.SessionTrainee.session_id, models.SessionTrainee.trainee_id, models.Attendance.present
+    ).join(
+        models.Session, models.Session.id == models.SessionTrainee.session_id
+    ).outerjoin(
+        models.Attendance, and_(
+            models.Attendance.session_id == models.SessionTrainee.session_id,
+            models.Attendance.trainee_id == models.SessionTrainee.trainee_id
+        )
+    ).filter(_trainer_sessions_filter(trainer_id, date_from, date_to)).all()
+
+def get_analytics_rollups(db: Session, metric: str, granularity: str, first_bucket, last_bucket):
+    return db.query(models.AnalyticsRollup).filter(
+        models.AnalyticsRollup.metric == metric,
+        models.AnalyticsRollup.granularity == granularity,
+        models.AnalyticsRollup.bucket_start >= first_bucket,
+        models.AnalyticsRollup.bucket_start <= last_bucket
+    ).all()
+
+def save_analytics_rollups(db: Session, metric: str, granularity: str, buckets: dict):
+    """Persist ``{bucket_start: {dimension: value}}``, replacing existing rows."""
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"metric": metric, "granularity": granularity, "bucket_start": bucket_start,
+         "dimension": dimension, "value": value, "computed_at": now}
+        for bucket_start, values in buckets.items() for dimension, value in values.items()
+    ]
+    if rows:
+        _upsert(db, models.AnalyticsRollup, rows, ["metric", "granularity", "bucket_start", "dimension"],
+                lambda new: {"value": new.value, "computed_at": new.computed_at})
+        db.commit()
+
+def delete_analytics_rollups(db: Session, since=None):
+    query = db.query(models.AnalyticsRollup)
+    if since is not None:
+        query = query.filter(models.AnalyticsRollup.bucket_start >= since)
+    deleted = query.delete()
+    db.commit()
+    return deleted
+
+def get_assigned_students(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    query = db.query(models.AssignedStudent).order_by(models.AssignedStudent.id)
+    if after_id is not None:
+        return query.filter(models.AssignedStudent.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+def get_assignments_for_user(db: Session, user: models.User, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    """Page of assignments visible to ``user`` with student and teacher joined in.
+
+    Trainers see their own trainees and trainees their own trainers; the
+    filter runs in SQL so pages are full, and the page is a single query.
+    """
+    query = db.query(models.AssignedStudent).options(
+        joinedload(models.AssignedStudent.student),
+        joinedload(models.AssignedStudent.teacher)
+    )
+    role = user.role.value
+    if role == "trainer":
+        query = query.filter(models.AssignedStudent.teacher_id == user.id)
+    elif role == "trainee":
+        query = query.filter(models.AssignedStudent.student_id == user.id)
+    elif role != "admin":
+        return []
+    query = query.order_by(models.AssignedStudent.id)
+    if after_id is not None:
+        return query.filter(models.AssignedStudent.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
 
 def get_assigned_student(db: Session, assignment_id: int):
     return db.query(models.AssignedStudent).filter(models.AssignedStudent.id == assignment_id).first()
@@ -309,10 +694,88 @@ def assign_student_to_teacher(db: Session, student_id: int, teacher_id: int):
 
     assignment = models.AssignedStudent(student_id=student_id, teacher_id=teacher_id, assigned_date=datetime.now(timezone.utc))
     db.add(assignment)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Lost a race on unique_student_teacher; the pair exists now
+        db.rollback()
+        return db.query(models.AssignedStudent).filter(
+            models.AssignedStudent.student_id == student_id,
+            models.AssignedStudent.teacher_id == teacher_id
+        ).first()
     db.refresh(assignment)
+    table_versions.bump("assignments")
     return assignment
 
+def bulk_assign_students(db: Session, pairs: List[tuple]):
+    """Assign many (student_id, teacher_id) pairs in one transaction.
+
+    Ids and roles are validated with one query and existing pairs found
+    with another; new pairs are inserted together. Returns one result dict
+    per input pair, in order, with a status of "assigned",
+    "already_assigned", "duplicate" (repeated in the request),
+    "invalid_student" or "invalid_teacher".
+    """
+    student_ids = {student_id for student_id, _ in pairs}
+    teacher_ids = {teacher_id for _, teacher_id in pairs}
+    roles = dict(db.query(models.User.id, models.User.role).filter(
+        models.User.id.in_(student_ids | teacher_ids)
+    ).all())
+    existing = {
+        (a.student_id, a.teacher_id): a.id
+        for a in db.query(models.AssignedStudent).filter(
+            models.AssignedStudent.student_id.in_(student_ids),
+            models.AssignedStudent.teacher_id.in_(teacher_ids)
+        )
+    }
+
+    results = []
+    seen = set()
+    to_insert = []
+    for student_id, teacher_id in pairs:
+        result = {"student_id": student_id, "teacher_id": teacher_id, "assignment_id": None}
+        if roles.get(student_id) != models.UserRole.trainee:
+            result["status"] = "invalid_student"
+        elif roles.get(teacher_id) != models.UserRole.trainer:
+            result["status"] = "invalid_teacher"
+        elif (student_id, teacher_id) in existing:
+            result["status"] = "already_assigned"
+            result["assignment_id"] = existing[(student_id, teacher_id)]
+        elif (student_id, teacher_id) in seen:
+            result["status"] = "duplicate"
+        else:
+            result["status"] = "assigned"
+            to_insert.append(result)
+        seen.add((student_id, teacher_id))
+        results.append(result)
+
+    if to_insert:
+        assigned_date = datetime.now(timezone.utc)
+        rows = [
+            {"student_id": r["student_id"], "teacher_id": r["teacher_id"], "assigned_date": assigned_date}
+            for r in to_insert
+        ]
+        # unique_student_teacher makes the insert duplicate-safe. If a
+        # concurrent writer added some of these pairs since the check above,
+        # redo row by row to learn which ones this call actually inserted.
+        if _insert_ignore(db, models.AssignedStudent, rows, ["student_id", "teacher_id"]) < len(rows):
+            db.rollback()
+            for r, row in zip(to_insert, rows):
+                if not _insert_ignore(db, models.AssignedStudent, [row], ["student_id", "teacher_id"]):
+                    r["status"] = "already_assigned"
+        new_ids = {
+            (a.student_id, a.teacher_id): a.id
+            for a in db.query(models.AssignedStudent).filter(
+                models.AssignedStudent.student_id.in_({r["student_id"] for r in to_insert}),
+                models.AssignedStudent.teacher_id.in_({r["teacher_id"] for r in to_insert})
+            )
+        }
+        for r in to_insert:
+            r["assignment_id"] = new_ids.get((r["student_id"], r["teacher_id"]))
+        db.commit()
+        table_versions.bump("assignments")
+    return results
+
 def unassign_student_from_teacher(db: Session, student_id: int, teacher_id: int):
     assignment = db.query(models.AssignedStudent).filter(
         models.AssignedStudent.student_id == student_id,
@@ -321,6 +784,7 @@ def unassign_student_from_teacher(db: Session, student_id: int, teacher_id: int)
     if assignment:
         db.delete(assignment)
         db.commit()
+        table_versions.bump("assignments")
         return True
     return False
 
@@ -329,126 +793,357 @@ def get_attendance(db: Session, attendance_id: int):
     return db.query(models.Attendance).filter(models.Attendance.id == attendance_id).first()
 
 def get_attendance_for_session(db: Session, session_id: int):
-    return db.query(models.Attendance).filter(models.Attendance.session_id == session_id).all()
+    return db.query(models.Attendance).options(
+        joinedload(models.Attendance.trainee)
+    ).filter(models.Attendance.session_id == session_id).all()
+
+def get_attendance_roster(db: Session, session_id: int):
+    """Every trainee enrolled in the session with their attendance, if marked.
+
+    One query: session_trainees JOIN users LEFT JOIN attendance. Returns
+    (User, Attendance | None) tuples ordered by trainee name.
+    """
+    return db.query(models.User, models.Attendance).select_from(models.SessionTrainee).join(
+        models.User, models.User.id == models.SessionTrainee.trainee_id
+    ).outerjoin(
+        models.Attendance, and_(
+            models.Attendance.session_id == models.SessionTrainee.session_id,
+            models.Attendance.trainee_id == models.SessionTrainee.trainee_id
+        )
+    ).filter(
+        models.SessionTrainee.session_id == session_id
+    ).order_by(models.User.last_name, models.User.first_name, models.User.id).all()
 
 def get_attendance_for_trainee(db: Session, trainee_id: int):
     return db.query(models.Attendance).filter(models.Attendance.trainee_id == trainee_id).all()
 
 def mark_attendance(db: Session, session_id: int, trainee_id: int, present: bool):
-    # Check if already marked
+    # Check if already marked; the row lock keeps the progress delta exact
+    # against concurrent marks of the same trainee
     existing = db.query(models.Attendance).filter(
         models.Attendance.session_id == session_id,
         models.Attendance.trainee_id == trainee_id
-    ).first()
+    ).with_for_update().first()
     if existing:
+        adjust_trainee_progress(db, {trainee_id: (0, int(present) - int(existing.present))})
         existing.present = present
         existing.marked_at = datetime.utcnow()
         db.commit()
         db.refresh(existing)
+        table_versions.bump("attendance")
         return existing
 
     attendance = models.Attendance(session_id=session_id, trainee_id=trainee_id, present=present)
     db.add(attendance)
+    adjust_trainee_progress(db, {trainee_id: (0, int(present))})
     db.commit()
     db.refresh(attendance)
+    table_versions.bump("attendance")
     return attendance
 
+def get_enrolled_trainee_ids(db: Session, session_id: int, trainee_ids) -> set:
+    """Return the subset of trainee_ids enrolled in the session, in one query."""
+    return {
+        trainee_id for (trainee_id,) in db.query(models.SessionTrainee.trainee_id).filter(
+            models.SessionTrainee.session_id == session_id,
+            models.SessionTrainee.trainee_id.in_(trainee_ids)
+        )
+    }
+
+def _upsert(db: Session, model, rows: List[dict], keys: List[str], updates):
+    """INSERT ... ON DUPLICATE KEY UPDATE in one statement.
+
+    ``keys`` name the unique key columns; ``updates(new)`` returns the
+    column -> expression mapping applied on conflict, where ``new`` refers
+    to the row that was proposed for insertion.
+    """
+    if db.get_bind().dialect.name == "mysql":
+        stmt = mysql.insert(model).values(rows)
+        stmt = stmt.on_duplicate_key_update(**updates(stmt.inserted))
+    else:
+        # SQLite (local development) spells the same upsert ON CONFLICT
+        stmt = sqlite.insert(model).values(rows)
+        stmt = stmt.on_conflict_do_update(index_elements=keys, set_=updates(stmt.excluded))
+    db.execute(stmt)
+
+def _insert_ignore(db: Session, model, rows: List[dict], keys: List[str]) -> int:
+    """Insert rows, skipping any that collide on the unique ``keys``; returns rows inserted."""
+    if db.get_bind().dialect.name == "mysql":
+        stmt = mysql.insert(model).values(rows).prefix_with("IGNORE")
+    else:
+        stmt = sqlite.insert(model).values(rows).on_conflict_do_nothing(index_elements=keys)
+    return db.execute(stmt).rowcount
+
+def _attendance_upsert(db: Session, rows: List[dict]):
+    """Insert-or-update on unique_session_trainee_attendance in one statement."""
+    _upsert(db, models.Attendance, rows, ["session_id", "trainee_id"],
+            lambda new: {"present": new.present, "marked_at": new.marked_at})
+
+def bulk_mark_attendance(db: Session, session_id: int, marks: dict):
+    """Upsert attendance for many trainees of one session in one transaction.
+
+    ``marks`` maps trainee_id -> present. Enrollment must already have been
+    checked. Returns the resulting attendance rows.
+    """
+    # Lock the existing rows (and, on InnoDB, the gaps for missing ones) so the
+    # progress deltas are computed from values no concurrent mark can change
+    previous = dict(db.query(models.Attendance.trainee_id, models.Attendance.present).filter(
+        models.Attendance.session_id == session_id,
+        models.Attendance.trainee_id.in_(marks.keys())
+    ).with_for_update().all())
+    adjust_trainee_progress(db, {
+        trainee_id: (0, int(present) - int(previous.get(trainee_id, False)))
+        for trainee_id, present in marks.items()
+    })
+    marked_at = datetime.now(timezone.utc)
+    _attendance_upsert(db, [
+        {"session_id": session_id, "trainee_id": trainee_id, "present": present, "marked_at": marked_at}
+        for trainee_id, present in marks.items()
+    ])
+    db.commit()
+    table_versions.bump("attendance")
+    return db.query(models.Attendance).filter(
+        models.Attendance.session_id == session_id,
+        models.Attendance.trainee_id.in_(marks.keys())
+    ).order_by(models.Attendance.trainee_id).all()
+
 def update_attendance(db: Session, attendance_id: int, present: bool):
-    attendance = db.query(models.Attendance).filter(models.Attendance.id == attendance_id).first()
+    attendance = db.query(models.Attendance).filter(models.Attendance.id == attendance_id).with_for_update().first()
     if attendance:
+        adjust_trainee_progress(db, {attendance.trainee_id: (0, int(present) - int(attendance.present))})
         attendance.present = present
         attendance.marked_at = datetime.utcnow()
         db.commit()
         db.refresh(attendance)
+        table_versions.bump("attendance")
         return attendance
     return None
 
 def delete_attendance(db: Session, attendance_id: int):
-    attendance = db.query(models.Attendance).filter(models.Attendance.id == attendance_id).first()
+    attendance = db.query(models.Attendance).filter(models.Attendance.id == attendance_id).with_for_update().first()
     if attendance:
         db.delete(attendance)
+        adjust_trainee_progress(db, {attendance.trainee_id: (0, -int(attendance.present))})
         db.commit()
+        table_versions.bump("attendance")
         return True
     return False
 
-def get_trainee_progress(db: Session, trainee_id: int):
-    # Get all sessions the trainee is enrolled in
-    enrolled_sessions = db.query(models.SessionTrainee).filter(models.SessionTrainee.trainee_id == trainee_id).all()
-    total_sessions = len(enrolled_sessions)
-
-    if total_sessions == 0:
-        return {
-            "trainee_id": trainee_id,
-            "total_sessions": 0,
-            "attended_sessions": 0,
-            "progress_percentage": 0.0
-        }
-
-    # Get attended sessions (present=True)
-    attended_count = db.query(models.Attendance).filter(
-        models.Attendance.trainee_id == trainee_id,
-        models.Attendance.present == True
-    ).count()
-
-    progress_percentage = (attended_count / total_sessions) * 100
-
+# Trainee progress. trainee_progress holds per-trainee counts of enrolled
+# sessions and present attendance; the write functions above adjust it in
+# the same transaction as the change, so progress reads are key lookups.
+def adjust_trainee_progress(db: Session, deltas: dict):
+    """Add ``{trainee_id: (total_delta, attended_delta)}`` to trainee_progress.
+
+    One atomic increment upsert; the caller commits.
+    """
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"trainee_id": trainee_id, "total_sessions": total, "attended_sessions": attended, "updated_at": now}
+        for trainee_id, (total, attended) in deltas.items() if total or attended
+    ]
+    if not rows:
+        return
+    table = models.TraineeProgress.__table__
+    _upsert(db, models.TraineeProgress, rows, ["trainee_id"], lambda new: {
+        "total_sessions": table.c.total_sessions + new.total_sessions,
+        "attended_sessions": table.c.attended_sessions + new.attended_sessions,
+        "updated_at": new.updated_at
+    })
+
+def refresh_trainee_progress(db: Session, trainee_ids=None, batch_size: int = 1000):
+    """Recount trainee_progress from session_trainees and attendance.
+
+    With ``trainee_ids`` only those rows are recomputed; otherwise the whole
+    table is rebuilt for every trainee. The caller commits. Returns the
+    number of rows written.
+    """
+    enrolled = db.query(
+        models.SessionTrainee.trainee_id.label("trainee_id"),
+        func.count(models.SessionTrainee.id).label("total")
+    ).group_by(models.SessionTrainee.trainee_id).subquery()
+    attended = db.query(
+        models.Attendance.trainee_id.label("trainee_id"),
+        func.count(models.Attendance.id).label("attended")
+    ).filter(models.Attendance.present == True).group_by(models.Attendance.trainee_id).subquery()
+    query = db.query(
+        models.User.id,
+        func.coalesce(enrolled.c.total, 0),
+        func.coalesce(attended.c.attended, 0)
+    ).outerjoin(
+        enrolled, enrolled.c.trainee_id == models.User.id
+    ).outerjoin(
+        attended, attended.c.trainee_id == models.User.id
+    )
+    if trainee_ids is None:
+        db.query(models.TraineeProgress).delete()
+        query = query.filter(models.User.role == models.UserRole.trainee)
+    else:
+        trainee_ids = list(trainee_ids)
+        if not trainee_ids:
+            return 0
+        query = query.filter(models.User.id.in_(trainee_ids))
+
+    now = datetime.now(timezone.utc)
+    written = 0
+    batch = []
+    for trainee_id, total, attended_count in query:
+        batch.append({"trainee_id": trainee_id, "total_sessions": total, "attended_sessions": attended_count, "updated_at": now})
+        if len(batch) >= batch_size:
+            written += _write_progress_rows(db, batch)
+            batch = []
+    if batch:
+        written += _write_progress_rows(db, batch)
+    return written
+
+def _write_progress_rows(db: Session, rows: List[dict]):
+    _upsert(db, models.TraineeProgress, rows, ["trainee_id"], lambda new: {
+        "total_sessions": new.total_sessions,
+        "attended_sessions": new.attended_sessions,
+        "updated_at": new.updated_at
+    })
+    return len(rows)
+
+def _progress_dict(trainee_id: int, total: int, attended: int):
+    if not total:
+        # Matches the previous on-the-fly count, which ignored attendance without enrolments
+        attended = 0
     return {
         "trainee_id": trainee_id,
-        "total_sessions": total_sessions,
-        "attended_sessions": attended_count,
-        "progress_percentage": round(progress_percentage, 2)
+        "total_sessions": total,
+        "attended_sessions": attended,
+        "progress_percentage": round(attended / total * 100, 2) if total else 0.0
     }
 
-def get_trainees_progress_for_trainer(db: Session, trainer_id: int):
-    # Get trainees assigned to this trainer
-    assignments = db.query(models.AssignedStudent).filter(models.AssignedStudent.teacher_id == trainer_id).all()
-    trainee_ids = [a.student_id for a in assignments]
-
-    progress_list = []
-    for trainee_id in trainee_ids:
-        progress = get_trainee_progress(db, trainee_id)
-        trainee = get_user(db, trainee_id)
-        progress["trainee"] = trainee
-        progress_list.append(progress)
-
-    return progress_list
+def get_trainee_progress(db: Session, trainee_id: int):
+    progress = db.get(models.TraineeProgress, trainee_id)
+    if progress is None:
+        return _progress_dict(trainee_id, 0, 0)
+    return _progress_dict(trainee_id, progress.total_sessions, progress.attended_sessions)
+
+def get_trainees_progress(db: Session, trainer_id: Optional[int] = None, skip: int = 0,
+                          limit: Optional[int] = None, after_id: Optional[int] = None):
+    """Progress for many trainees in one query over trainee_progress.
+
+    With ``trainer_id`` only that trainer's assigned trainees are included,
+    otherwise every trainee. Ordered by trainee id.
+    """
+    query = db.query(
+        models.User,
+        func.coalesce(models.TraineeProgress.total_sessions, 0),
+        func.coalesce(models.TraineeProgress.attended_sessions, 0)
+    ).outerjoin(
+        models.TraineeProgress, models.TraineeProgress.trainee_id == models.User.id
+    )
+    if trainer_id is not None:
+        query = query.join(
+            models.AssignedStudent, models.AssignedStudent.student_id == models.User.id
+        ).filter(models.AssignedStudent.teacher_id == trainer_id)
+    else:
+        query = query.filter(models.User.role == models.UserRole.trainee)
+    if after_id is not None:
+        query = query.filter(models.User.id > after_id)
+    query = query.order_by(models.User.id)
+    if after_id is None:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+
+    return [
+        {**_progress_dict(trainee.id, total, attended_count), "trainee": trainee}
+        for trainee, total, attended_count in query
+    ]
 
-def get_trainees_for_trainer(db: Session, trainer_id: int):
+def get_trainees_progress_for_trainer(db: Session, trainer_id: int):
+    return get_trainees_progress(db, trainer_id=trainer_id)
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # MySQL hands back naive datetimes; they are stored in UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def get_trainees_for_trainer(db: Session, trainer_id: int, skip: int = 0,
+                             limit: Optional[int] = None, after_id: Optional[int] = None):
+    """Activity summary for a trainer's assigned trainees in two queries.
+
+    The first query pages through the assigned trainees, joined to their
+    per-trainee session count, latest session created_at and latest
+    attendance marked_at with this trainer. The second loads the session
+    lists for that page only. A trainee is active if either date falls
+    within the last 30 days.
+    """
     from datetime import timedelta
-    # Get all trainees assigned to this trainer
-    assignments = db.query(models.AssignedStudent).filter(models.AssignedStudent.teacher_id == trainer_id).all()
-
-    result = []
-    for assignment in assignments:
-        trainee = assignment.student
-        # Get sessions created by this trainer that include this trainee
-        sessions = db.query(models.Session).join(models.SessionTrainee).filter(
+    session_stats = db.query(
+        models.SessionTrainee.trainee_id.label("trainee_id"),
+        func.count(models.Session.id).label("sessions_count"),
+        func.max(models.Session.created_at).label("last_session_date")
+    ).join(
+        models.Session, models.Session.id == models.SessionTrainee.session_id
+    ).filter(
+        models.Session.trainer_id == trainer_id
+    ).group_by(models.SessionTrainee.trainee_id).subquery()
+    attendance_stats = db.query(
+        models.Attendance.trainee_id.label("trainee_id"),
+        func.max(models.Attendance.marked_at).label("last_attendance_date")
+    ).join(
+        models.Session, models.Session.id == models.Attendance.session_id
+    ).filter(
+        models.Session.trainer_id == trainer_id
+    ).group_by(models.Attendance.trainee_id).subquery()
+
+    query = db.query(
+        models.User,
+        func.coalesce(session_stats.c.sessions_count, 0),
+        session_stats.c.last_session_date,
+        attendance_stats.c.last_attendance_date
+    ).join(
+        models.AssignedStudent, models.AssignedStudent.student_id == models.User.id
+    ).outerjoin(
+        session_stats, session_stats.c.trainee_id == models.User.id
+    ).outerjoin(
+        attendance_stats, attendance_stats.c.trainee_id == models.User.id
+    ).filter(models.AssignedStudent.teacher_id == trainer_id)
+    if after_id is not None:
+        query = query.filter(models.User.id > after_id)
+    query = query.order_by(models.User.id)
+    if after_id is None:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    rows = query.all()
+
+    sessions_by_trainee = {trainee.id: [] for trainee, *_ in rows}
+    if sessions_by_trainee:
+        session_rows = db.query(
+            models.SessionTrainee.trainee_id,
+            models.Session.id,
+            models.Session.title,
+            models.Session.created_at
+        ).join(
+            models.Session, models.Session.id == models.SessionTrainee.session_id
+        ).filter(
             models.Session.trainer_id == trainer_id,
-            models.SessionTrainee.trainee_id == trainee.id
-        ).all()
-
-        sessions_data = [{
-            'id': session.id,
-            'title': session.title,
-            'created_at': session.created_at
-        } for session in sessions]
-
-        sessions_count = len(sessions_data)
-        # Get last active: max of session created_at or attendance marked_at
-        last_session_date = max([s['created_at'] for s in sessions_data]) if sessions_data else None
-        # Get last attendance in any session with this trainer
-        last_attendance = db.query(models.Attendance).join(models.Session).filter(
-            models.Attendance.trainee_id == trainee.id,
-            models.Session.trainer_id == trainer_id
-        ).order_by(models.Attendance.marked_at.desc()).first()
-        last_attendance_date = last_attendance.marked_at if last_attendance else None
-        last_active = max([d for d in [last_session_date, last_attendance_date] if d], default=None)
+            models.SessionTrainee.trainee_id.in_(sessions_by_trainee.keys())
+        ).order_by(models.Session.id)
+        for trainee_id, session_id, title, created_at in session_rows:
+            sessions_by_trainee[trainee_id].append({
+                'id': session_id,
+                'title': title,
+                'created_at': created_at
+            })
+
+    now = datetime.now(timezone.utc)
+    result = []
+    for trainee, sessions_count, last_session_date, last_attendance_date in rows:
+        last_active = max(
+            [d for d in [_as_utc(last_session_date), _as_utc(last_attendance_date)] if d], default=None
+        )
         # Status: active if last active within 30 days
-        status = 'active' if last_active and (datetime.now(timezone.utc) - last_active) < timedelta(days=30) else 'inactive'
-
+        status = 'active' if last_active and (now - last_active) < timedelta(days=30) else 'inactive'
         result.append({
             'trainee': trainee,
-            'sessions': sessions_data,
+            'sessions': sessions_by_trainee[trainee.id],
             'sessions_count': sessions_count,
             'last_active': last_active,
             'status': status
@@ -0,0 +1,121 @@
+import asyncio
+import itertools
+import logging
+import uuid
+from typing import Tuple
+
+from backend.serialization import dumps_json, loads_json
+
+
+class InMemoryEventBus:
+    """Delivers events to this process only (single uvicorn worker).
+
+    Sequence numbers restart with the process, so each instance numbers its
+    events in a stream of its own.
+    """
+
+    def __init__(self):
+        self._handler = None
+        self._stream = uuid.uuid4().hex
+        self._sequence = itertools.count(1)
+
+    async def start(self, handler):
+        self._handler = handler
+
+    async def stop(self):
+        self._handler = None
+
+    async def next_sequence(self) -> Tuple[str, int]:
+        """(stream, seq) for the next event."""
+        return self._stream, next(self._sequence)
+
+    async def publish(self, message: dict, topics=None):
+        if self._handler is not None:
+            await self._handler(message, topics)
+
+
+class RedisEventBus:
+    """Relays events between worker processes over a Redis pub/sub channel.
+
+    Events are delivered to local sockets immediately and published for the
+    other workers; each worker ignores the copies it published itself.
+    Events relayed from other workers reach the handler with ``remote=True``.
+    ``client`` is a redis.asyncio client (or a compatible stand-in such as
+    fakeredis.aioredis.FakeRedis).
+    """
+
+    def __init__(self, client, channel: str):
+        self.client = client
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._handler = None
+        self._pubsub = None
+        self._listener = None
+
+    async def start(self, handler):
+        self._handler = handler
+        self._pubsub = self.client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.channel)
+            await self._pubsub.close()
+            self._pubsub = None
+        self._handler = None
+
+    async def next_sequence(self) -> Tuple[str, int]:
+        """Cluster-wide (stream, seq), shared by all workers.
+
+        The stream id is created alongside the counter, so if Redis loses the
+        counter the numbering restarts under a new stream.
+        """
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.incr(f"{self.channel}:seq")
+            pipe.set(f"{self.channel}:stream", uuid.uuid4().hex, nx=True)
+            pipe.get(f"{self.channel}:stream")
+            seq, _, stream = await pipe.execute()
+        if isinstance(stream, bytes):
+            stream = stream.decode()
+        return stream, seq
+
+    async def publish(self, message: dict, topics=None):
+        if self._handler is not None:
+            await self._handler(message, topics)
+        envelope = {"origin": self.origin, "topics": topics, "message": message}
+        try:
+            await self.client.publish(self.channel, dumps_json(envelope))
+        except Exception as e:
+            logging.error(f"Failed to publish event to {self.channel}: {e}")
+
+    async def _listen(self):
+        while True:
+            try:
+                async for item in self._pubsub.listen():
+                    if item.get("type") != "message":
+                        continue
+                    envelope = loads_json(item["data"])
+                    if envelope.get("origin") == self.origin:
+                        continue
+                    await self._handler(envelope["message"], envelope.get("topics"), remote=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Event bus listener error on {self.channel}: {e}")
+                await asyncio.sleep(1)
+
+
+def create_event_bus(url: str, channel: str):
+    """Build the bus selected by EVENT_BUS_URL; empty means in-process only."""
+    if not url:
+        return InMemoryEventBus()
+    import redis.asyncio as redis
+    return RedisEventBus(redis.from_url(url), channel)
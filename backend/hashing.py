@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+from backend.config import get_settings
+
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+
+class HashingBusyError(Exception):
+    """Raised when the hashing queue is full and the request is shed."""
+
+
+class LatencyStats:
+    """Running count/total/max of operation latencies, in seconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "count": self.count,
+                "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+                "max_ms": round(self.max * 1000, 3),
+            }
+
+
+class PasswordHasher:
+    """Runs password hashing on a dedicated thread pool.
+
+    At most ``max_pending`` operations may be running or queued at once;
+    anything beyond that raises HashingBusyError instead of waiting.
+    """
+
+    def __init__(self, context: CryptContext, max_workers: int, max_pending: int):
+        self.context = context
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.stats = {"hash": LatencyStats(), "verify": LatencyStats()}
+
+    async def hash(self, password: str) -> str:
+        future = self._submit("hash", self.context.hash, password)
+        return await asyncio.wrap_future(future)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        future = self._submit("verify", self.context.verify, password, hashed)
+        return await asyncio.wrap_future(future)
+
+    def hash_blocking(self, password: str) -> str:
+        """Like hash(), for sync callers running in a worker thread."""
+        return self._submit("hash", self.context.hash, password).result()
+
+    def verify_blocking(self, password: str, hashed: str) -> bool:
+        """Like verify(), for sync callers running in a worker thread."""
+        return self._submit("verify", self.context.verify, password, hashed).result()
+
+    def metrics(self):
+        return {
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+            "hash": self.stats["hash"].snapshot(),
+            "verify": self.stats["verify"].snapshot(),
+        }
+
+    def _submit(self, operation: str, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HashingBusyError("Password hashing queue is full")
+            self._pending += 1
+        try:
+            return self._executor.submit(self._run, operation, fn, *args)
+        except Exception:
+            self._release()
+            raise
+
+    def _run(self, operation: str, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.stats[operation].record(time.perf_counter() - started)
+            self._release()
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+
+_settings = get_settings()
+
+password_hasher = PasswordHasher(
+    pwd_context,
+    max_workers=_settings.PASSWORD_HASH_WORKERS,
+    max_pending=_settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -7,11 +7,14 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from dotenv import load_dotenv
 load_dotenv()
 
+import asyncio
 import jwt
 import json
 import io
 import logging
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
 from dotenv import load_dotenv
 
 from fastapi import (
@@ -22,6 +25,7 @@ from fastapi import (
     WebSocket,
     WebSocketDisconnect,
     Request,
+    Query,
 )
 from fastapi.responses import (
     StreamingResponse,
@@ -34,6 +38,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
+from starlette.concurrency import run_in_threadpool
 from backend.config import get_settings
 
 # Initialize FastAPI app
@@ -53,10 +58,27 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from backend.config import get_settings
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Optional, Set
 
 from database import models
-from backend import schemas, crud, reporting
+from backend import schemas, crud, reporting, cohorts
+from backend.attendance_matrix import AttendanceMatrix
+from backend.cache import principal_cache, entity_cache, table_versions
+from backend.analytics import analytics_counters, buckets_back, timeseries_rollups
+from backend.hashing import password_hasher, HashingBusyError
+from backend import serialization
+from backend.serialization import (
+    EncodedMessage,
+    FastJSONResponse,
+    attendance_to_dict,
+    dumps_json,
+    session_export_dict,
+    session_summary_dict,
+    session_to_dict,
+    user_to_dict,
+)
+from backend.event_bus import InMemoryEventBus, create_event_bus
+from backend.pagination import encode_cursor, decode_cursor, InvalidCursorError
 from database.database import engine, get_db, SessionLocal
 from sqlalchemy.orm import joinedload
 
@@ -74,6 +96,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],                # Allow all HTTP methods
     allow_headers=["*"],                # Allow all headers
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
 # JWT configuration
@@ -83,12 +106,98 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 1440
 
 security = HTTPBearer()
 
+# WebSocket topics. Every connection is subscribed to its own user and role
+# topics (plus its trainer topic for trainers); session topics are opt-in.
+def user_topic(user_id: int) -> str:
+    return f"user:{user_id}"
+
+def role_topic(role: str) -> str:
+    return f"role:{role}"
+
+def trainer_topic(trainer_id: int) -> str:
+    return f"trainer:{trainer_id}"
+
+def session_topic(session_id: int) -> str:
+    return f"session:{session_id}"
+
+def default_topics(user) -> Set[str]:
+    role = user.role.value
+    topics = {user_topic(user.id), role_topic(role)}
+    if role == "trainer":
+        topics.add(trainer_topic(user.id))
+    return topics
+
+def session_audience(session_id: int, trainer_id: int, trainee_ids=()) -> List[str]:
+    """Topics interested in changes to one session."""
+    return [
+        role_topic("admin"),
+        session_topic(session_id),
+        trainer_topic(trainer_id),
+        *(user_topic(trainee_id) for trainee_id in trainee_ids),
+    ]
+
+def user_audience(user_id: int) -> List[str]:
+    """Topics interested in changes to one user account."""
+    return [role_topic("admin"), role_topic("trainer"), user_topic(user_id)]
+
 # WebSocket connection manager for real-time updates
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+WS_PROTOCOLS = ("json", "msgpack")
+
+class ClientConnection:
+    """One accepted socket with its outbound queue and writer task."""
+
+    def __init__(self, websocket: WebSocket, user: models.User, queue_size: int, protocol: str = "json"):
+        self.websocket = websocket
+        self.user = user
+        self.protocol = protocol
+        self.topics: Set[str] = set()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.writer: asyncio.Task = None
 
-    async def connect(self, websocket: WebSocket, token: str = None):
+class ConnectionManager:
+    """Fans events out to sockets without awaiting any single client.
+
+    broadcast() only enqueues onto each recipient's bounded queue; a writer
+    task per connection drains it. When a queue is full the slow consumer
+    either loses its oldest message ("drop_oldest") or is disconnected
+    ("disconnect"), per WS_SLOW_CONSUMER_POLICY.
+
+    Each event is encoded once per wire protocol ("json" text frames, or
+    "msgpack" binary frames negotiated with ?protocol=msgpack) and the same
+    frame is sent to every recipient.
+
+    Events go through ``bus`` so that, with a Redis-backed bus, every
+    uvicorn worker relays them to the sockets it holds.
+
+    Every event is stamped with a sequence number ("seq") within a numbering
+    "stream" (which changes whenever the numbering restarts), and the last
+    ``replay_size`` events are kept so a reconnecting client can ask for
+    what it missed with /ws?since=<stream>:<seq>.
+    """
+
+    def __init__(self, queue_size: int = 100, slow_consumer_policy: str = "drop_oldest", bus=None, replay_size: int = 1000):
+        self.bus = bus or InMemoryEventBus()
+        self.history = deque(maxlen=replay_size)
+        self.stream = None
+        self.last_sequence = 0
+        self.queue_size = queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self.connections: Dict[WebSocket, ClientConnection] = {}
+        self.subscriptions: Dict[str, Set[WebSocket]] = {}
+        # The loop only keeps weak references to tasks; hold pending closes
+        self.closing: Set[asyncio.Task] = set()
+        self.dropped_messages = 0
+        self.evictions = 0
+        self.send_failures = 0
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.connections)
+
+    async def connect(self, websocket: WebSocket, token: str = None, protocol: str = "json"):
+        if protocol not in WS_PROTOCOLS or (protocol == "msgpack" and serialization.msgpack is None):
+            await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+            return
         # Verify token on WebSocket connection
         if token is None:
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
@@ -103,29 +212,277 @@ class ConnectionManager:
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
             return
 
+        user = principal_cache.get((username, token))
+        if user is None:
+            user = await run_in_threadpool(self._load_principal, username)
+            if user is not None:
+                principal_cache.set((username, token), user)
+        if user is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+
         await websocket.accept()
-        self.active_connections.append(websocket)
-        logging.info(f"WebSocket connection established. Total connections: {len(self.active_connections)}")
+        connection = ClientConnection(websocket, user, self.queue_size, protocol)
+        connection.writer = asyncio.create_task(self._write_loop(connection))
+        self.connections[websocket] = connection
+        self.subscribe(websocket, default_topics(user))
+        logging.info(f"WebSocket connection established. Total connections: {len(self.connections)}")
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            logging.info(f"WebSocket connection closed. Total connections: {len(self.active_connections)}")
-
-    async def broadcast(self, message: dict):
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logging.error(f"Failed to send message to WebSocket: {e}")
-                disconnected.append(connection)
-        for conn in disconnected:
-            self.disconnect(conn)
-        if disconnected:
-            logging.warning(f"Removed {len(disconnected)} disconnected WebSocket connections")
-
-manager = ConnectionManager()
+        connection = self.connections.pop(websocket, None)
+        if connection is None:
+            return
+        self.unsubscribe(websocket, list(connection.topics))
+        if connection.writer is not None and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+        logging.info(f"WebSocket connection closed. Total connections: {len(self.connections)}")
+
+    def close(self, websocket: WebSocket, code: int):
+        """Disconnect a socket now and send its close frame in the background."""
+        self.disconnect(websocket)
+        task = asyncio.create_task(self._close(websocket, code))
+        self.closing.add(task)
+        task.add_done_callback(self.closing.discard)
+
+    def user_sockets(self, user_id: int) -> List[WebSocket]:
+        return [websocket for websocket, connection in self.connections.items() if connection.user.id == user_id]
+
+    def resubscribe(self, websocket: WebSocket, user: models.User, topics):
+        """Swap a socket's principal and replace its subscriptions with topics."""
+        connection = self.connections.get(websocket)
+        if connection is None:
+            return
+        self.unsubscribe(websocket, list(connection.topics))
+        connection.user = user
+        self.subscribe(websocket, topics)
+
+    def subscribe(self, websocket: WebSocket, topics):
+        connection = self.connections.get(websocket)
+        if connection is None:
+            return
+        for topic in topics:
+            self.subscriptions.setdefault(topic, set()).add(websocket)
+            connection.topics.add(topic)
+
+    def unsubscribe(self, websocket: WebSocket, topics):
+        connection = self.connections.get(websocket)
+        for topic in topics:
+            subscribers = self.subscriptions.get(topic)
+            if subscribers is not None:
+                subscribers.discard(websocket)
+                if not subscribers:
+                    del self.subscriptions[topic]
+            if connection is not None:
+                connection.topics.discard(topic)
+
+    def recipients(self, topics=None) -> List[WebSocket]:
+        """Connections subscribed to any of topics, or every connection if topics is None."""
+        if topics is None:
+            return list(self.connections)
+        recipients = {}
+        for topic in topics:
+            for connection in self.subscriptions.get(topic, ()):
+                recipients[connection] = None
+        return list(recipients)
+
+    async def start(self, handler=None):
+        """Start receiving events; ``handler`` defaults to deliver()."""
+        await self.bus.start(handler or self.deliver)
+
+    async def stop(self):
+        await self.bus.stop()
+
+    async def broadcast(self, message: dict, topics=None):
+        stream, seq = await self.bus.next_sequence()
+        message = {**message, "stream": stream, "seq": seq}
+        await self.bus.publish(message, topics)
+
+    async def deliver(self, message: dict, topics=None, remote: bool = False):
+        """Fan an event out to this worker's own sockets."""
+        encoded = EncodedMessage(message)
+        seq = message.get("seq")
+        if seq is not None:
+            if message.get("stream") != self.stream:
+                # Numbering restarted; older buffered events can't be resumed from
+                self.stream = message.get("stream")
+                self.history.clear()
+                self.last_sequence = 0
+            self.history.append((seq, topics, encoded))
+            self.last_sequence = max(self.last_sequence, seq)
+        for websocket in self.recipients(topics):
+            self.send(websocket, encoded)
+
+    def replay(self, websocket: WebSocket, stream: str, since: int):
+        """Queue the buffered events after ``since`` that this socket may see.
+
+        Sends a "resync_required" message instead when ``stream`` is not the
+        current numbering stream, or when some of those events are no longer
+        buffered (or would not fit in the outbound queue).
+        """
+        connection = self.connections.get(websocket)
+        if connection is None or (stream == self.stream and since == self.last_sequence):
+            return
+        oldest = self.history[0][0] if self.history else self.last_sequence + 1
+        missed = sorted(
+            (entry for entry in self.history
+             if entry[0] > since and (entry[1] is None or connection.topics.intersection(entry[1]))),
+            key=lambda entry: entry[0]
+        )
+        if (stream != self.stream or since + 1 < oldest or since > self.last_sequence
+                or len(missed) > self.queue_size):
+            self.send(websocket, {
+                "type": "resync_required",
+                "data": {
+                    "stream": self.stream,
+                    "since": since,
+                    "oldest_seq": oldest,
+                    "latest_seq": self.last_sequence
+                }
+            })
+            return
+        for _, _, encoded in missed:
+            self.send(websocket, encoded)
+
+    def send(self, websocket: WebSocket, message):
+        """Queue a message for one connection without waiting for delivery."""
+        connection = self.connections.get(websocket)
+        if connection is None:
+            return
+        if not isinstance(message, EncodedMessage):
+            message = EncodedMessage(message)
+        try:
+            connection.queue.put_nowait(message)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        if self.slow_consumer_policy == "disconnect":
+            self.evictions += 1
+            logging.warning("Disconnecting slow WebSocket consumer: outbound queue full")
+            self.close(websocket, status.WS_1013_TRY_AGAIN_LATER)
+        else:
+            connection.queue.get_nowait()
+            connection.queue.put_nowait(message)
+            self.dropped_messages += 1
+
+    def metrics(self):
+        depths = [c.queue.qsize() for c in self.connections.values()]
+        return {
+            "connections": len(self.connections),
+            "topics": len(self.subscriptions),
+            "stream": self.stream,
+            "last_sequence": self.last_sequence,
+            "replay_buffered": len(self.history),
+            "queued_messages": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "queue_size": self.queue_size,
+            "slow_consumer_policy": self.slow_consumer_policy,
+            "dropped_messages": self.dropped_messages,
+            "evictions": self.evictions,
+            "send_failures": self.send_failures,
+        }
+
+    async def _write_loop(self, connection: ClientConnection):
+        try:
+            while True:
+                message = await connection.queue.get()
+                if connection.protocol == "msgpack":
+                    await connection.websocket.send_bytes(message.msgpack)
+                else:
+                    await connection.websocket.send_text(message.text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Failed to send message to WebSocket: {e}")
+            self.send_failures += 1
+            self.disconnect(connection.websocket)
+
+    @staticmethod
+    def _load_principal(username: str) -> Optional[models.User]:
+        db = SessionLocal()
+        try:
+            user = crud.get_user_by_username(db, username)
+            if user is not None:
+                db.expunge(user)
+            return user
+        finally:
+            db.close()
+
+    async def _close(self, websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+
+manager = ConnectionManager(
+    queue_size=settings.WS_SEND_QUEUE_SIZE,
+    slow_consumer_policy=settings.WS_SLOW_CONSUMER_POLICY,
+    bus=create_event_bus(settings.EVENT_BUS_URL, settings.EVENT_BUS_CHANNEL),
+    replay_size=settings.WS_REPLAY_BUFFER_SIZE
+)
+
+# Write events that change a cached single-entity response or principal.
+# Invalidation runs wherever the event is delivered, so every worker drops
+# its own copies.
+USER_EVENTS = {"user_updated", "user_deleted", "password_changed", "password_reset"}
+SESSION_EVENTS = {
+    "session_updated",
+    "session_deleted",
+    "trainee_added_to_session",
+    "trainee_removed_from_session",
+    "trainee_joined_via_link",
+}
+
+def invalidate_cached_entities(message: dict):
+    event_type = message.get("type")
+    data = message.get("data") or {}
+    if event_type in USER_EVENTS:
+        # Also drops cached logins: role, password or existence changed
+        principal_cache.invalidate_user(data["user_id"])
+        entity_cache.invalidate("user", data["user_id"])
+        entity_cache.invalidate_sessions_of_user(data["user_id"])
+    elif event_type in SESSION_EVENTS:
+        entity_cache.invalidate("session", data["session_id"])
+
+# Tables each write event changes, matching the crud functions' bumps. Those
+# bumps only happen in the worker that ran the write, so events relayed from
+# other workers bump here to keep this worker's ETags from going stale.
+TABLES_BY_EVENT = {
+    "user_created": ("users",),
+    "user_updated": ("users",),
+    "password_changed": ("users",),
+    "password_reset": ("users",),
+    "user_deleted": ("users", "sessions", "assignments", "attendance"),
+    "session_created": ("sessions",),
+    "session_updated": ("sessions",),
+    "session_deleted": ("sessions", "attendance"),
+    "trainee_added_to_session": ("sessions",),
+    "trainee_removed_from_session": ("sessions",),
+    "trainee_joined_via_link": ("sessions",),
+    "attendance_marked": ("attendance",),
+    "attendance_bulk_marked": ("attendance",),
+    "attendance_updated": ("attendance",),
+    "attendance_deleted": ("attendance",),
+    "student_assigned": ("assignments",),
+    "students_assigned": ("assignments",),
+    "student_unassigned": ("assignments",),
+}
+
+async def handle_event(message: dict, topics=None, remote: bool = False):
+    if remote:
+        table_versions.bump(*TABLES_BY_EVENT.get(message.get("type"), ()))
+    invalidate_cached_entities(message)
+    analytics_counters.apply(message)
+    await refresh_ws_principals(message)
+    await manager.deliver(message, topics)
+
+@app.on_event("startup")
+async def start_event_bus():
+    await manager.start(handle_event)
+
+@app.on_event("shutdown")
+async def stop_event_bus():
+    await manager.stop()
 
 # Authentication functions
 def create_access_token(data: dict):
@@ -150,15 +507,69 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
         logging.warning(f"Token validation failed: {str(e)}")
         raise HTTPException(status_code=401, detail="Invalid token")
 
-def get_current_user(db: Session = Depends(get_db), username: str = Depends(verify_token)):
-    logging.info(f"get_current_user called with username: {username}")
+def get_current_user(db: Session = Depends(get_db), username: str = Depends(verify_token), credentials: HTTPAuthorizationCredentials = Depends(security)):
+    cache_key = (username, credentials.credentials)
+    user = principal_cache.get(cache_key)
+    if user is not None:
+        return user
+
+    logging.debug(f"get_current_user cache miss for username: {username}")
     user = crud.get_user_by_username(db, username)
     if not user:
         logging.warning(f"User not found for username: {username}")
         raise HTTPException(status_code=404, detail="User not found")
-    logging.info(f"User found: {user.username} with role: {user.role}")
+    # Detach so later commits in this request don't expire the cached copy
+    db.expunge(user)
+    principal_cache.set(cache_key, user)
+    logging.debug(f"User found: {user.username} with role: {user.role}")
     return user
 
+# Pagination helpers. List endpoints accept an opaque ?cursor= (keyset on id)
+# as an alternative to ?skip=, and return the next page's cursor in the
+# X-Next-Cursor header so the response body stays a plain list.
+def cursor_after_id(cursor: Optional[str]) -> Optional[int]:
+    if cursor is None:
+        return None
+    try:
+        after_id = decode_cursor(cursor)["id"]
+    except (InvalidCursorError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(after_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after_id
+
+def session_cursor_position(cursor: Optional[str], sort: str) -> Optional[dict]:
+    """Decode a /sessions/ cursor; date-sorted cursors also carry scheduled_date."""
+    if cursor is None:
+        return None
+    position = {"id": cursor_after_id(cursor)}
+    if sort != "id":
+        try:
+            position["scheduled_date"] = datetime.fromisoformat(decode_cursor(cursor)["scheduled_date"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
+
+def set_next_cursor(response: Response, rows, limit: int, position=lambda row: {"id": row.id}):
+    if limit > 0 and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(position(rows[-1]))
+
+# Conditional GET. Validators come from the per-table change counters that
+# the crud write functions bump, so a 304 costs no query and no serialization.
+def not_modified(request: Request, response: Response, current_user: models.User, *tables: str) -> Optional[Response]:
+    """Stamp ETag/Last-Modified on response; return a 304 if the client's copy is current."""
+    scope = f"{current_user.id}:{request.url.path}?{request.url.query}"
+    headers = {
+        "ETag": table_versions.etag(scope, *tables),
+        "Last-Modified": format_datetime(table_versions.last_modified(*tables), usegmt=True),
+    }
+    # Only the ETag decides: modification times are per worker process
+    if_none_match = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+    if headers["ETag"] in if_none_match or "*" in if_none_match:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
 # Authentication routes
 @app.post("/auth/login", response_model=schemas.TokenResponse)
 def login(login_data: schemas.LoginRequest, db: Session = Depends(get_db)):
@@ -180,10 +591,10 @@ async def change_password(request: schemas.ChangePasswordRequest, db: Session =
     if current_user.role.value != "admin" and not current_user.is_temporary_password:
         if not request.current_password:
             raise HTTPException(status_code=400, detail="Current password required")
-        if not crud.authenticate_user(db, current_user.username, request.current_password):
+        if not await crud.authenticate_user_async(db, current_user.username, request.current_password):
             raise HTTPException(status_code=401, detail="Invalid current password")
 
-    updated_user = crud.change_password(db, current_user.id, request.new_password, current_user.id)
+    updated_user = await crud.change_password_async(db, current_user.id, request.new_password, current_user.id)
 
     # Broadcast password change event
     await manager.broadcast({
@@ -193,7 +604,7 @@ async def change_password(request: schemas.ChangePasswordRequest, db: Session =
             "action": "changed",
             "message": f"Password changed for user {current_user.name}"
         }
-    })
+    }, topics=[role_topic("admin"), user_topic(current_user.id)])
 
     return {"message": "Password changed successfully"}
 
@@ -206,7 +617,7 @@ async def reset_password(user_id: int, request: schemas.ResetPasswordRequest, db
     if not target_user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    updated_user = crud.reset_password(db, user_id, request.new_password, current_user.id)
+    updated_user = await crud.reset_password_async(db, user_id, request.new_password, current_user.id)
 
     # Broadcast password reset event
     await manager.broadcast({
@@ -217,7 +628,7 @@ async def reset_password(user_id: int, request: schemas.ResetPasswordRequest, db
             "new_password": request.new_password,  # In production, don't broadcast password
             "message": f"Password reset for user {target_user.name}. New temporary password: {request.new_password}"
         }
-    })
+    }, topics=[role_topic("admin"), user_topic(user_id)])
 
     return {"message": "Password reset successfully"}
 
@@ -226,7 +637,7 @@ async def admin_change_password(request: schemas.ChangePasswordRequest, db: Sess
     if current_user.role.value != "admin":
         raise HTTPException(status_code=403, detail="Only admins can change password without current password")
 
-    updated_user = crud.change_password(db, current_user.id, request.new_password, current_user.id)
+    updated_user = await crud.change_password_async(db, current_user.id, request.new_password, current_user.id)
 
     # Broadcast password change event
     await manager.broadcast({
@@ -236,32 +647,28 @@ async def admin_change_password(request: schemas.ChangePasswordRequest, db: Sess
             "action": "changed",
             "message": f"Admin password changed for user {current_user.name}"
         }
-    })
+    }, topics=[role_topic("admin"), user_topic(current_user.id)])
 
     return {"message": "Password changed successfully"}
 
 # AssignedStudent routes
 @app.get("/assignments/", response_model=List[schemas.AssignedStudentWithDetails])
-def read_assignments(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def read_assignments(request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     if current_user.role.value not in ["admin", "trainer", "trainee"]:
         raise HTTPException(status_code=403, detail="Not authorized")
-    assignments = crud.get_assigned_students(db, skip=skip, limit=limit)
-    # Load relationships
-    result = []
-    for assignment in assignments:
-        result.append({
-            "id": assignment.id,
-            "student": assignment.student,
-            "teacher": assignment.teacher,
-            "assigned_date": assignment.assigned_date
-        })
-    # Filter based on role
-    if current_user.role.value == "trainee":
-        result = [a for a in result if a["student"].id == current_user.id]
-    elif current_user.role.value == "trainer":
-        result = [a for a in result if a["teacher"].id == current_user.id]
-    # For admin, return all
-    return result
+    cached = not_modified(request, response, current_user, "assignments", "users")
+    if cached:
+        return cached
+    # Role scoping and user loading happen in SQL
+    assignments = crud.get_assignments_for_user(db, current_user, skip=skip, limit=limit, after_id=cursor_after_id(cursor))
+    set_next_cursor(response, assignments, limit)
+    result = [{
+        "id": assignment.id,
+        "student": user_to_dict(assignment.student),
+        "teacher": user_to_dict(assignment.teacher),
+        "assigned_date": assignment.assigned_date
+    } for assignment in assignments]
+    return FastJSONResponse(result, headers=dict(response.headers))
 
 @app.post("/assignments/", response_model=schemas.AssignedStudent)
 async def assign_student(assignment: schemas.AssignedStudentCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
@@ -304,10 +711,37 @@ async def assign_student(assignment: schemas.AssignedStudentCreate, db: Session
             "teacher_id": assignment.teacher_id,
             "assigned_date": created_assignment.assigned_date.isoformat()
         }
-    })
+    }, topics=[role_topic("admin"), trainer_topic(assignment.teacher_id), user_topic(assignment.student_id)])
 
     return created_assignment
 
+@app.post("/assignments/bulk", response_model=schemas.AssignedStudentBulkResponse)
+async def assign_students_bulk(request: schemas.AssignedStudentBulkCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+    if current_user.role.value != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can assign students")
+
+    results = crud.bulk_assign_students(db, [(a.student_id, a.teacher_id) for a in request.assignments])
+    assigned = [r for r in results if r["status"] == "assigned"]
+
+    if assigned:
+        # One aggregated event for the whole batch
+        await manager.broadcast({
+            "type": "students_assigned",
+            "data": {
+                "assignments": [{
+                    "assignment_id": r["assignment_id"],
+                    "student_id": r["student_id"],
+                    "teacher_id": r["teacher_id"]
+                } for r in assigned]
+            }
+        }, topics=[
+            role_topic("admin"),
+            *{trainer_topic(r["teacher_id"]) for r in assigned},
+            *{user_topic(r["student_id"]) for r in assigned}
+        ])
+
+    return {"assigned": len(assigned), "results": results}
+
 @app.delete("/assignments/{student_id}/{teacher_id}")
 async def unassign_student(student_id: int, teacher_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     if current_user.role.value != "admin":
@@ -324,7 +758,7 @@ async def unassign_student(student_id: int, teacher_id: int, db: Session = Depen
             "student_id": student_id,
             "teacher_id": teacher_id
         }
-    })
+    }, topics=[role_topic("admin"), trainer_topic(teacher_id), user_topic(student_id)])
 
     return {"message": "Student unassigned successfully"}
 
@@ -343,18 +777,48 @@ def read_attendance_for_session(session_id: int, db: Session = Depends(get_db),
         raise HTTPException(status_code=403, detail="Not authorized for this session")
 
     attendance_records = crud.get_attendance_for_session(db, session_id)
-    # Populate relationships
+    # Build the session payload once; schemas.Session expects trainee ids
+    session_data = session_summary_dict(session, [st.trainee_id for st in session.trainees])
     result = []
     for record in attendance_records:
         result.append({
             "id": record.id,
-            "session": record.session,
+            "session": session_data,
             "trainee": record.trainee,
             "present": record.present,
             "marked_at": record.marked_at
         })
     return result
 
+@app.get("/attendance/session/{session_id}/roster", response_model=schemas.AttendanceRoster)
+def read_attendance_roster(session_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+    if current_user.role.value not in ["admin", "trainer"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    session = crud.get_session(db, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    if current_user.role.value == "trainer" and session.trainer_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized for this session")
+
+    roster = []
+    for trainee, record in crud.get_attendance_roster(db, session_id):
+        roster.append({
+            "trainee": user_to_dict(trainee),
+            "marked": record is not None,
+            "attendance_id": record.id if record else None,
+            "present": record.present if record else None,
+            "marked_at": record.marked_at if record else None
+        })
+    return FastJSONResponse({
+        "session": session_summary_dict(session, [entry["trainee"]["id"] for entry in roster]),
+        "enrolled": len(roster),
+        "marked": sum(1 for entry in roster if entry["marked"]),
+        "present": sum(1 for entry in roster if entry["present"]),
+        "roster": roster
+    })
+
 @app.post("/attendance/", response_model=schemas.Attendance)
 async def mark_attendance(attendance: schemas.AttendanceCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     if current_user.role.value not in ["admin", "trainer"]:
@@ -387,10 +851,46 @@ async def mark_attendance(attendance: schemas.AttendanceCreate, db: Session = De
             "present": attendance.present,
             "marked_at": marked_attendance.marked_at.isoformat()
         }
-    })
+    }, topics=session_audience(session.id, session.trainer_id, [attendance.trainee_id]))
 
     return marked_attendance
 
+@app.post("/attendance/bulk", response_model=List[schemas.Attendance])
+async def mark_attendance_bulk(request: schemas.AttendanceBulkCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+    if current_user.role.value not in ["admin", "trainer"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    session = crud.get_session(db, request.session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    if current_user.role.value == "trainer" and session.trainer_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized for this session")
+
+    # Later entries for the same trainee win
+    marks = {record.trainee_id: record.present for record in request.records}
+    enrolled = crud.get_enrolled_trainee_ids(db, session.id, marks.keys())
+    not_enrolled = sorted(set(marks) - enrolled)
+    if not_enrolled:
+        raise HTTPException(status_code=400, detail=f"Trainees not enrolled in this session: {not_enrolled}")
+
+    records = crud.bulk_mark_attendance(db, session.id, marks)
+
+    # One event for the whole roster
+    await manager.broadcast({
+        "type": "attendance_bulk_marked",
+        "data": {
+            "session_id": session.id,
+            "records": [{
+                "trainee_id": record.trainee_id,
+                "present": record.present,
+                "marked_at": record.marked_at.isoformat()
+            } for record in records]
+        }
+    }, topics=session_audience(session.id, session.trainer_id, list(marks)))
+
+    return FastJSONResponse([attendance_to_dict(record) for record in records])
+
 @app.put("/attendance/{attendance_id}", response_model=schemas.Attendance)
 async def update_attendance(attendance_id: int, present: bool, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     if current_user.role.value not in ["admin", "trainer"]:
@@ -413,7 +913,7 @@ async def update_attendance(attendance_id: int, present: bool, db: Session = Dep
             "present": present,
             "marked_at": updated_attendance.marked_at.isoformat()
         }
-    })
+    }, topics=session_audience(session.id, session.trainer_id, [updated_attendance.trainee_id]))
 
     return updated_attendance
 
@@ -422,6 +922,11 @@ async def delete_attendance(attendance_id: int, db: Session = Depends(get_db), c
     if current_user.role.value != "admin":
         raise HTTPException(status_code=403, detail="Only admins can delete attendance records")
 
+    record = crud.get_attendance(db, attendance_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Attendance record not found")
+    audience = session_audience(record.session_id, record.session.trainer_id, [record.trainee_id])
+
     success = crud.delete_attendance(db, attendance_id)
     if not success:
         raise HTTPException(status_code=404, detail="Attendance record not found")
@@ -432,7 +937,7 @@ async def delete_attendance(attendance_id: int, db: Session = Depends(get_db), c
         "data": {
             "attendance_id": attendance_id
         }
-    })
+    }, topics=audience)
 
     return {"message": "Attendance record deleted"}
 
@@ -461,46 +966,134 @@ def get_trainee_progress(trainee_id: int, db: Session = Depends(get_db), current
     return progress
 
 @app.get("/progress/trainer/{trainer_id}", response_model=List[schemas.TraineeProgress])
-def get_trainees_progress_for_trainer(trainer_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def get_trainees_progress_for_trainer(trainer_id: int, request: Request, response: Response, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     if current_user.role.value not in ["admin", "trainer"]:
         raise HTTPException(status_code=403, detail="Not authorized")
 
     if current_user.role.value == "trainer" and current_user.id != trainer_id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    return crud.get_trainees_progress_for_trainer(db, trainer_id)
+    cached = not_modified(request, response, current_user, "users", "sessions", "assignments", "attendance")
+    if cached:
+        return cached
+    progress = crud.get_trainees_progress_for_trainer(db, trainer_id)
+    return FastJSONResponse(
+        [{**p, "trainee": user_to_dict(p["trainee"])} for p in progress],
+        headers=dict(response.headers)
+    )
+
+@app.get("/progress/trainees", response_model=List[schemas.TraineeProgress])
+def get_all_trainees_progress(request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+    if current_user.role.value != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can view progress for all trainees")
+
+    cached = not_modified(request, response, current_user, "users", "sessions", "attendance")
+    if cached:
+        return cached
+    progress = crud.get_trainees_progress(db, skip=skip, limit=limit, after_id=cursor_after_id(cursor))
+    set_next_cursor(response, progress, limit, position=lambda p: {"id": p["trainee_id"]})
+    return FastJSONResponse(
+        [{**p, "trainee": user_to_dict(p["trainee"])} for p in progress],
+        headers=dict(response.headers)
+    )
 
 @app.get("/trainers/{trainer_id}/trainees")
-def get_trainees_for_trainer(trainer_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def get_trainees_for_trainer(trainer_id: int, response: Response, skip: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     if current_user.role.value not in ["admin", "trainer"]:
         raise HTTPException(status_code=403, detail="Not authorized")
 
     if current_user.role.value == "trainer" and current_user.id != trainer_id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    trainees_data = crud.get_trainees_for_trainer(db, trainer_id)
-    return trainees_data
+    # Without a limit every assigned trainee is returned, as before
+    trainees_data = crud.get_trainees_for_trainer(db, trainer_id, skip=skip, limit=limit, after_id=cursor_after_id(cursor))
+    if limit is not None:
+        set_next_cursor(response, trainees_data, limit, position=lambda t: {"id": t["trainee"].id})
+    return FastJSONResponse(
+        [{**t, "trainee": user_to_dict(t["trainee"])} for t in trainees_data],
+        headers=dict(response.headers)
+    )
+
+def trainer_attendance_matrix(db: Session, current_user: models.User, trainer_id: int,
+                              date_from: Optional[datetime], date_to: Optional[datetime]) -> AttendanceMatrix:
+    if current_user.role.value not in ["admin", "trainer"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    if current_user.role.value == "trainer" and current_user.id != trainer_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    return AttendanceMatrix.from_db(db, trainer_id, date_from, date_to)
+
+@app.get("/trainers/{trainer_id}/attendance-matrix")
+def get_attendance_matrix(trainer_id: int, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+    """Who attended what across the trainer's sessions.
+
+    ``rows[i][j]`` is the status of ``trainees[i]`` in ``sessions[j]``,
+    one character per cell as described by ``legend``. Sessions are
+    limited to ``date_from <= scheduled_date < date_to``; ``date_to`` is
+    exclusive, as on ``/sessions/``.
+    """
+    matrix = trainer_attendance_matrix(db, current_user, trainer_id, date_from, date_to)
+    return FastJSONResponse({"trainer_id": trainer_id, **matrix.to_dict()})
+
+@app.get("/trainers/{trainer_id}/attendance-matrix/export")
+def export_attendance_matrix(trainer_id: int, format: str = "csv", date_from: Optional[datetime] = None, date_to: Optional[datetime] = None, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+    """Attendance matrix as CSV or Excel; ``date_to`` is exclusive, as on ``/sessions/``."""
+    matrix = trainer_attendance_matrix(db, current_user, trainer_id, date_from, date_to)
+    filename = f"attendance-matrix-{trainer_id}-{datetime.now().strftime('%Y%m%d')}"
+
+    if format == "csv":
+        report_data = reporting.generate_attendance_matrix_csv(matrix)
+        return StreamingResponse(
+            io.StringIO(report_data.getvalue()),
+            media_type="text/csv",
+            headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
+        )
+    elif format == "excel":
+        report_data = reporting.generate_attendance_matrix_excel(matrix)
+        return StreamingResponse(
+            report_data,
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers={"Content-Disposition": f"attachment; filename={filename}.xlsx"}
+        )
+    else:
+        raise HTTPException(status_code=400, detail="Unsupported format. Use 'excel' or 'csv'")
 
 # User routes
 @app.get("/users/", response_model=List[schemas.User])
-def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def read_users(request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     logging.info(f"read_users called by user {current_user.username} with role {current_user.role}")
     if current_user.role.value not in ["admin", "trainer"]:
         logging.warning(f"User {current_user.username} not authorized for users")
         raise HTTPException(status_code=403, detail="Not authorized")
-    users = crud.get_users(db, skip=skip, limit=limit)
+    cached = not_modified(request, response, current_user, "users")
+    if cached:
+        return cached
+    users = crud.get_users(db, skip=skip, limit=limit, after_id=cursor_after_id(cursor))
+    set_next_cursor(response, users, limit)
     logging.info(f"Retrieved {len(users)} users")
     logging.info("read_users completed")
-    return users
+    return FastJSONResponse([user_to_dict(user) for user in users], headers=dict(response.headers))
 
 @app.get("/users/{user_id}", response_model=schemas.User)
-def read_user(user_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def read_user(user_id: int, request: Request, response: Response, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     if current_user.role.value not in ["admin", "trainer"] and current_user.id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized")
+    cached = not_modified(request, response, current_user, "users")
+    if cached:
+        return cached
+    result = entity_cache.get(("user", user_id))
+    if result is not None:
+        return result
+
+    version = table_versions.version("users")
     user = crud.get_user(db, user_id=user_id)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    result = schemas.User.model_validate(user)
+    if table_versions.version("users") == version:
+        entity_cache.set(("user", user_id), result)
+    return result
 
 @app.post("/users/")
 async def create_user(user: schemas.UserCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
@@ -515,7 +1108,7 @@ async def create_user(user: schemas.UserCreate, db: Session = Depends(get_db), c
     if crud.get_user_by_email(db, user.email):
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    created_user, temporary_password = crud.create_user(db, user)
+    created_user, temporary_password = await crud.create_user_async(db, user)
 
     # Log user creation
     crud.log_user_creation(db, created_user.id, current_user.id)
@@ -526,12 +1119,9 @@ async def create_user(user: schemas.UserCreate, db: Session = Depends(get_db), c
         "data": {
             "user_id": created_user.id,
             "action": "created",
-            "user": {
-                **created_user.__dict__,
-                'name': f"{created_user.first_name} {created_user.last_name}"
-            }
+            "user": schemas.User.model_validate(created_user).model_dump(mode="json")
         }
-    })
+    }, topics=user_audience(created_user.id))
 
     # Return user data with temporary password for secure sharing by admin
     return {
@@ -545,22 +1135,27 @@ async def update_user(user_id: int, user_update: schemas.UserUpdate, db: Session
     if current_user.role.value != "admin" and current_user.id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    updated_user = crud.update_user(db, user_id, user_update)
+    previous_role = None
+    if user_update.role is not None:
+        existing_user = crud.get_user(db, user_id)
+        previous_role = existing_user.role.value if existing_user else None
+
+    updated_user = await crud.update_user_async(db, user_id, user_update)
     if updated_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
     # Broadcast user update event
+    event_data = {
+        "user_id": user_id,
+        "action": "updated",
+        "user": schemas.User.model_validate(updated_user).model_dump(mode="json")
+    }
+    if previous_role is not None:
+        event_data["previous_role"] = previous_role
     await manager.broadcast({
         "type": "user_updated",
-        "data": {
-            "user_id": user_id,
-            "action": "updated",
-            "user": {
-                **updated_user.__dict__,
-                'name': f"{updated_user.first_name} {updated_user.last_name}"
-            }
-        }
-    })
+        "data": event_data
+    }, topics=user_audience(user_id))
 
     return updated_user
 
@@ -569,6 +1164,11 @@ async def delete_user(user_id: int, db: Session = Depends(get_db), current_user:
     if current_user.role.value != "admin":
         raise HTTPException(status_code=403, detail="Only admins can delete users")
 
+    user = crud.get_user(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    role = user.role.value
+
     success = crud.delete_user(db, user_id)
     if not success:
         raise HTTPException(status_code=404, detail="User not found")
@@ -578,60 +1178,81 @@ async def delete_user(user_id: int, db: Session = Depends(get_db), current_user:
         "type": "user_deleted",
         "data": {
             "user_id": user_id,
-            "action": "deleted"
+            "action": "deleted",
+            "role": role
         }
-    })
+    }, topics=user_audience(user_id))
 
     return {"message": "User deleted successfully"}
 
 # Session routes
 @app.get("/sessions/", response_model=List[schemas.SessionWithTrainees])
-def read_sessions(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def read_sessions(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    status: Optional[schemas.SessionStatus] = None,
+    trainer_id: Optional[int] = None,
+    trainee_id: Optional[int] = None,
+    sort: str = "id",
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
     logging.info(f"read_sessions called by user {current_user.username} with role {current_user.role}")
-    sessions = crud.get_sessions(db, skip=skip, limit=limit)
-
-    # Filter sessions based on user role for security
-    filtered_sessions = []
-    for session in sessions:
-        if current_user.role.value == "admin":
-            # Admins see all sessions
-            filtered_sessions.append(session)
-        elif current_user.role.value == "trainer":
-            # Trainers see only sessions they created
-            if session.trainer_id == current_user.id:
-                filtered_sessions.append(session)
-        elif current_user.role.value == "trainee":
-            # Trainees see only sessions they're assigned to
-            session_trainees = crud.get_session_trainees(db, session.id)
-            trainee_ids = [st.trainee_id for st in session_trainees]
-            if current_user.id in trainee_ids:
-                filtered_sessions.append(session)
-
-    # Populate trainees for filtered sessions
-    result = []
-    for session in filtered_sessions:
-        session_trainees = crud.get_session_trainees(db, session.id)
-        trainees = [st.trainee for st in session_trainees]
-        result.append({
-            **session.__dict__,
-            'trainees': trainees
-        })
+    if sort not in crud.SESSION_SORTS:
+        raise HTTPException(status_code=400, detail=f"Unsupported sort. Use one of: {', '.join(crud.SESSION_SORTS)}")
+    cached = not_modified(request, response, current_user, "sessions", "users")
+    if cached:
+        return cached
+
+    # Role scoping, filtering and trainee loading happen in SQL
+    sessions = crud.get_sessions_for_user(
+        db, current_user,
+        skip=skip,
+        limit=limit,
+        after=session_cursor_position(cursor, sort),
+        date_from=date_from,
+        date_to=date_to,
+        status=models.SessionStatus(status.value) if status else None,
+        trainer_id=trainer_id,
+        trainee_id=trainee_id,
+        sort=sort
+    )
+    if sort == "id":
+        set_next_cursor(response, sessions, limit)
+    else:
+        set_next_cursor(response, sessions, limit, lambda s: {"id": s.id, "scheduled_date": s.scheduled_date.isoformat()})
+
+    result = [session_to_dict(session) for session in sessions]
     logging.info(f"Retrieved {len(result)} filtered sessions for user {current_user.username}")
     logging.info("read_sessions completed")
-    return result
+    return FastJSONResponse(result, headers=dict(response.headers))
 
 @app.get("/sessions/{session_id}", response_model=schemas.SessionWithTrainees)
-def read_session(session_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    session = crud.get_session(db, session_id=session_id)
+def read_session(session_id: int, request: Request, response: Response, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+    cached = not_modified(request, response, current_user, "sessions", "users")
+    if cached:
+        return cached
+    result = entity_cache.get(("session", session_id))
+    if result is not None:
+        return result
+
+    version = table_versions.version("sessions", "users")
+    session = crud.get_session_with_trainees(db, session_id)
     if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    # Populate trainees
-    session_trainees = crud.get_session_trainees(db, session.id)
-    trainees = [st.trainee for st in session_trainees]
-    return {
+    result = schemas.SessionWithTrainees.model_validate({
         **session.__dict__,
-        'trainees': trainees
-    }
+        'trainees': [st.trainee for st in session.trainees]
+    })
+    # Skip caching if a write landed while we were reading
+    if table_versions.version("sessions", "users") == version:
+        entity_cache.set(("session", session_id), result)
+    return result
 
 @app.post("/sessions/", response_model=schemas.SessionWithTrainees)
 async def create_session(session: schemas.SessionCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
@@ -660,18 +1281,24 @@ async def create_session(session: schemas.SessionCreate, db: Session = Depends(g
             "created_at": created_session.created_at.isoformat(),
             "updated_at": created_session.updated_at.isoformat()
         }
-    })
+    }, topics=session_audience(created_session.id, created_session.trainer_id, [t.id for t in trainees]))
 
-    return {
-        **created_session.__dict__,
-        'trainees': trainees
-    }
+    return FastJSONResponse(session_to_dict(created_session, trainees))
 
 @app.put("/sessions/{session_id}", response_model=schemas.SessionWithTrainees)
 async def update_session(session_id: int, session_update: schemas.SessionUpdate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     if current_user.role.value not in ["admin", "trainer"]:
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    existing_session = crud.get_session(db, session_id)
+    if existing_session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    previous_status = existing_session.status.value if session_update.status is not None else None
+    # Trainees removed and a replaced trainer must still hear about the
+    # change, so the audience covers the roster before and after the update
+    previous_trainer_id = existing_session.trainer_id
+    previous_trainee_ids = [st.trainee_id for st in crud.get_session_trainees(db, session_id)]
+
     updated_session = crud.update_session(db, session_id, session_update)
     if updated_session is None:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -681,22 +1308,26 @@ async def update_session(session_id: int, session_update: schemas.SessionUpdate,
     trainees = [st.trainee for st in session_trainees]
 
     # Broadcast session update event
+    event_data = {
+        "session_id": session_id,
+        "status": updated_session.status.value,
+        "updated_at": updated_session.updated_at.isoformat(),
+        "trainees": [t.id for t in trainees],
+        "trainer": updated_session.trainer_id,
+        "startTime": updated_session.scheduled_date.isoformat()
+    }
+    if previous_status is not None:
+        event_data["previous_status"] = previous_status
+    topics = session_audience(session_id, updated_session.trainer_id, [t.id for t in trainees])
+    if previous_trainer_id != updated_session.trainer_id:
+        topics.append(trainer_topic(previous_trainer_id))
+    topics.extend(user_topic(trainee_id) for trainee_id in previous_trainee_ids if trainee_id not in event_data["trainees"])
     await manager.broadcast({
         "type": "session_updated",
-        "data": {
-            "session_id": session_id,
-            "status": updated_session.status.value,
-            "updated_at": updated_session.updated_at.isoformat(),
-            "trainees": [t.id for t in trainees],
-            "trainer": updated_session.trainer_id,
-            "startTime": updated_session.scheduled_date.isoformat()
-        }
-    })
+        "data": event_data
+    }, topics=topics)
 
-    return {
-        **updated_session.__dict__,
-        'trainees': trainees
-    }
+    return FastJSONResponse(session_to_dict(updated_session, trainees))
 
 @app.post("/sessions/{session_id}/trainees/{trainee_id}")
 async def add_trainee_to_session(session_id: int, trainee_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
@@ -735,13 +1366,13 @@ async def add_trainee_to_session(session_id: int, trainee_id: int, db: Session =
             "trainee_id": trainee_id,
             "updated_at": session.updated_at.isoformat()
         }
-    })
+    }, topics=session_audience(session_id, session.trainer_id, [trainee_id]))
 
-    # Broadcast notification to the trainee
+    # Send notification to the trainee
     await manager.broadcast({
         "type": "notification",
         "data": notification_data
-    })
+    }, topics=[user_topic(trainee_id)])
 
     return {"message": "Trainee added to session"}
 
@@ -767,7 +1398,7 @@ async def remove_trainee_from_session(session_id: int, trainee_id: int, db: Sess
             "trainee_id": trainee_id,
             "updated_at": session.updated_at.isoformat()
         }
-    })
+    }, topics=session_audience(session_id, session.trainer_id, [trainee_id]))
 
     return {"message": "Trainee removed from session"}
 
@@ -776,6 +1407,12 @@ async def delete_session(session_id: int, db: Session = Depends(get_db), current
     if current_user.role.value != "admin":
         raise HTTPException(status_code=403, detail="Only admins can delete sessions")
 
+    session = crud.get_session(db, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    audience = session_audience(session_id, session.trainer_id, [st.trainee_id for st in session.trainees])
+    status = session.status.value
+
     success = crud.delete_session(db, session_id)
     if not success:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -784,24 +1421,136 @@ async def delete_session(session_id: int, db: Session = Depends(get_db), current
     await manager.broadcast({
         "type": "session_deleted",
         "data": {
-            "session_id": session_id
+            "session_id": session_id,
+            "status": status
         }
-    })
+    }, topics=audience)
 
     return {"message": "Session deleted successfully"}
 
 # Analytics routes
 @app.get("/analytics/users")
-def get_user_analytics(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def get_user_analytics(request: Request, response: Response, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     if current_user.role.value != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
-    return crud.get_user_count_by_role(db)
+    cached = not_modified(request, response, current_user, "users")
+    if cached:
+        return cached
+    return analytics_counters.get(db, "users_by_role")
 
 @app.get("/analytics/sessions")
-def get_session_analytics(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def get_session_analytics(request: Request, response: Response, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     if current_user.role.value != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
-    return crud.get_session_count_by_status(db)
+    cached = not_modified(request, response, current_user, "sessions")
+    if cached:
+        return cached
+    return analytics_counters.get(db, "sessions_by_status")
+
+@app.get("/analytics/summary")
+def get_analytics_summary(request: Request, response: Response, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+    """All dashboard counters in one response."""
+    if current_user.role.value != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    cached = not_modified(request, response, current_user, "users", "sessions")
+    if cached:
+        return cached
+    counters = analytics_counters.snapshot(db)
+    return {
+        **counters,
+        "total_users": sum(counters["users_by_role"].values()),
+        "total_sessions": sum(counters["sessions_by_status"].values())
+    }
+
+@app.get("/analytics/timeseries")
+def get_analytics_timeseries(
+    metric: str = Query(..., pattern="^(sessions|training_minutes|attendance)$"),
+    granularity: str = Query("day", pattern="^(day|week|month)$"),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Per-bucket values of a metric; defaults to the last 30 buckets up to today.
+
+    sessions: counts by status; training_minutes: scheduled minutes by
+    trainer id (cancelled excluded); attendance: marked ("total") and
+    present records with their rate. Every bucket has a "total".
+    """
+    if current_user.role.value != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    end = end or datetime.now(timezone.utc).date()
+    start = start or buckets_back(end, granularity, 29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    try:
+        series = timeseries_rollups.series(db, metric, granularity, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    buckets = []
+    for bucket_start, values in series:
+        bucket = {"start": bucket_start.isoformat(), "values": values}
+        if metric == "attendance":
+            bucket["rate"] = round(values.get("present", 0) / values["total"] * 100, 2) if values["total"] else None
+        buckets.append(bucket)
+    return FastJSONResponse({
+        "metric": metric,
+        "granularity": granularity,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "buckets": buckets
+    })
+
+@app.get("/analytics/cohorts")
+def get_cohort_analytics(weeks: int = Query(12, ge=1, le=104), db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+    """Attendance-rate percentiles, per-trainer distributions and a weekly retention curve."""
+    if current_user.role.value != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    # No conditional GET: retention eligibility moves with the clock
+    data = cohorts.CohortArrays.from_db(db, batch_size=settings.EXPORT_BATCH_SIZE)
+    return FastJSONResponse(cohorts.cohort_report(data, retention_weeks=weeks))
+
+# Streaming NDJSON exports for LMS sync
+def ndjson_export(stream, project, since: Optional[datetime]):
+    """Stream one JSON object per line from a crud.stream_* query.
+
+    The generator owns its DB session: it outlives the request dependency
+    while the response body is being sent.
+    """
+    def generate():
+        db = SessionLocal()
+        try:
+            lines = []
+            for row in stream(db, since=since, batch_size=settings.EXPORT_BATCH_SIZE):
+                lines.append(dumps_json(project(row)))
+                if len(lines) >= settings.EXPORT_BATCH_SIZE:
+                    yield b"\n".join(lines) + b"\n"
+                    lines = []
+            if lines:
+                yield b"\n".join(lines) + b"\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@app.get("/export/users")
+def export_users(since: Optional[datetime] = None, current_user: models.User = Depends(get_current_user)):
+    if current_user.role.value != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return ndjson_export(crud.stream_users, user_to_dict, since)
+
+@app.get("/export/sessions")
+def export_sessions(since: Optional[datetime] = None, current_user: models.User = Depends(get_current_user)):
+    if current_user.role.value != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return ndjson_export(crud.stream_sessions, session_export_dict, since)
+
+@app.get("/export/attendance")
+def export_attendance(since: Optional[datetime] = None, current_user: models.User = Depends(get_current_user)):
+    if current_user.role.value != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return ndjson_export(crud.stream_attendance, attendance_to_dict, since)
 
 # Report generation endpoint
 @app.get("/reports/generate")
@@ -839,18 +1588,131 @@ def generate_report(format: str = "pdf", db: Session = Depends(get_db), current_
     else:
         raise HTTPException(status_code=400, detail="Unsupported format. Use 'pdf', 'excel', or 'csv'")
 
+def can_subscribe(db: Session, user: models.User, topic: str) -> bool:
+    kind, _, value = topic.partition(":")
+    role = user.role.value
+    if role == "admin":
+        return kind in ("user", "role", "trainer", "session") and value != ""
+    if kind == "user":
+        return value == str(user.id)
+    if kind == "role":
+        return value == role
+    if kind == "trainer":
+        return role == "trainer" and value == str(user.id)
+    if kind == "session" and value.isdigit():
+        session = crud.get_session(db, int(value))
+        if session is None:
+            return False
+        if role == "trainer":
+            return session.trainer_id == user.id
+        return db.query(models.SessionTrainee).filter(
+            models.SessionTrainee.session_id == session.id,
+            models.SessionTrainee.trainee_id == user.id
+        ).first() is not None
+    return False
+
+def subscribable_topics(user: models.User, topics) -> List[str]:
+    """The topics user may subscribe to, checked in a session of its own."""
+    db = SessionLocal()
+    try:
+        return [t for t in topics if can_subscribe(db, user, t)]
+    finally:
+        db.close()
+
+def reload_ws_principal(user_id: int, topics):
+    """(user, the topics they may still hold), or (None, []) if the user is gone."""
+    db = SessionLocal()
+    try:
+        user = crud.get_user(db, user_id)
+        if user is None:
+            return None, []
+        db.expunge(user)
+        return user, [t for t in topics if can_subscribe(db, user, t)] + sorted(default_topics(user))
+    finally:
+        db.close()
+
+async def refresh_ws_principals(message: dict):
+    """Keep open sockets in step with their user's role and existence.
+
+    Topics are checked when subscribed, so a demoted user would otherwise
+    keep e.g. role:admin (and its password_reset payloads) until reconnecting.
+    Deleted users' sockets are closed; on a role change each socket gets the
+    new principal, its new default topics and whichever old topics it may
+    still subscribe to.
+    """
+    event_type = message.get("type")
+    if event_type not in ("user_updated", "user_deleted"):
+        return
+    data = message.get("data") or {}
+    user_id = data["user_id"]
+    if event_type == "user_deleted":
+        for websocket in manager.user_sockets(user_id):
+            manager.close(websocket, status.WS_1008_POLICY_VIOLATION)
+        return
+
+    role = (data.get("user") or {}).get("role")
+    for websocket in manager.user_sockets(user_id):
+        connection = manager.connections.get(websocket)
+        if connection is None or connection.user.role.value == role:
+            continue
+        user, topics = await run_in_threadpool(reload_ws_principal, user_id, list(connection.topics))
+        if user is None:
+            manager.close(websocket, status.WS_1008_POLICY_VIOLATION)
+        else:
+            manager.resubscribe(websocket, user, topics)
+
+async def handle_ws_message(websocket: WebSocket, data: str):
+    """Handle {"action": "subscribe" | "unsubscribe", "topics": [...]} client messages.
+
+    Control messages are JSON text frames whatever protocol the socket uses.
+    """
+    try:
+        message = json.loads(data)
+    except ValueError:
+        message = None
+    if not isinstance(message, dict) or message.get("action") not in ("subscribe", "unsubscribe"):
+        manager.send(websocket, {"type": "error", "data": {"message": "Unsupported message"}})
+        return
+
+    topics = [t for t in message.get("topics", []) if isinstance(t, str)]
+    if message["action"] == "unsubscribe":
+        manager.unsubscribe(websocket, topics)
+        manager.send(websocket, {"type": "unsubscribed", "data": {"topics": topics}})
+        return
+
+    connection = manager.connections.get(websocket)
+    if connection is None:
+        return
+    allowed = await run_in_threadpool(subscribable_topics, connection.user, topics)
+    manager.subscribe(websocket, allowed)
+    manager.send(websocket, {
+        "type": "subscribed",
+        "data": {
+            "topics": allowed,
+            "rejected": [t for t in topics if t not in allowed]
+        }
+    })
+
 # WebSocket endpoint for real-time updates
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     # Extract token from query params
     token = websocket.query_params.get("token")
-    await manager.connect(websocket, token)
+    protocol = websocket.query_params.get("protocol", "json")
+    await manager.connect(websocket, token, protocol)
     if websocket not in manager.active_connections:
         return
+    since = websocket.query_params.get("since")
+    if since is not None:
+        # since=<stream>:<seq>; a bare seq can't be matched to a stream and
+        # gets resync_required
+        stream, _, seq = since.rpartition(":")
+        if seq.isdigit():
+            manager.replay(websocket, stream, int(seq))
     try:
         while True:
             data = await websocket.receive_text()
-            await manager.broadcast(f"Client message: {data}")
+            await handle_ws_message(websocket, data)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception as e:
@@ -911,7 +1773,7 @@ async def join_session_via_link(session_link: str, db: Session = Depends(get_db)
                 "session_link": session_link,
                 "message": f"Trainee {current_user.name} joined session '{session.title}' via link"
             }
-        })
+        }, topics=session_audience(session.id, session.trainer_id, [current_user.id]))
 
     # Redirect to class_link if available
     if session.class_link:
@@ -940,6 +1802,19 @@ async def join_session_via_link(session_link: str, db: Session = Depends(get_db)
             }
         )
 
+# Runtime metrics
+@app.get("/metrics")
+def get_metrics(current_user: models.User = Depends(get_current_user)):
+    if current_user.role.value != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return {
+        "password_hashing": password_hasher.metrics(),
+        "principal_cache": principal_cache.metrics(),
+        "entity_cache": entity_cache.metrics(),
+        "analytics_counters": analytics_counters.metrics(),
+        "websocket": manager.metrics()
+    }
+
 # Root endpoint
 @app.get("/")
 def root():
@@ -962,6 +1837,15 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         content={"detail": exc.detail}
     )
 
+@app.exception_handler(HashingBusyError)
+async def hashing_busy_handler(request: Request, exc: HashingBusyError):
+    logging.warning(f"Shedding request {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": "1"}
+    )
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     return JSONResponse(
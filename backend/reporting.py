@@ -85,6 +85,31 @@ def generate_excel_report(users, sessions):
     output.seek(0)
     return output
 
+def generate_attendance_matrix_csv(matrix):
+    output = io.StringIO()
+    writer = csv.writer(output)
+    header, rows = matrix.table()
+    writer.writerow(header)
+    writer.writerows(rows)
+    output.seek(0)
+    return output
+
+def generate_attendance_matrix_excel(matrix):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Attendance"
+    header, rows = matrix.table()
+    ws.append(header)
+    for row in rows:
+        ws.append(row)
+    # Keep trainee names and session headers visible while scrolling
+    ws.freeze_panes = "C2"
+
+    output = io.BytesIO()
+    wb.save(output)
+    output.seek(0)
+    return output
+
 def generate_pdf_report(users, sessions):
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter)
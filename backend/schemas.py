@@ -156,6 +156,19 @@ class AssignedStudent(AssignedStudentBase):
     class Config:
         from_attributes = True
 
+class AssignedStudentBulkCreate(BaseModel):
+    assignments: List[AssignedStudentCreate] = Field(..., min_length=1, max_length=1000)
+
+class AssignmentResult(BaseModel):
+    student_id: int
+    teacher_id: int
+    status: str  # "assigned", "already_assigned", "duplicate", "invalid_student", "invalid_teacher"
+    assignment_id: Optional[int] = None
+
+class AssignedStudentBulkResponse(BaseModel):
+    assigned: int
+    results: List[AssignmentResult]
+
 class AssignedStudentWithDetails(BaseModel):
     id: int
     student: User
@@ -184,6 +197,28 @@ class Attendance(AttendanceBase):
     class Config:
         from_attributes = True
 
+class AttendanceRosterEntry(BaseModel):
+    trainee: User
+    marked: bool
+    attendance_id: Optional[int] = None
+    present: Optional[bool] = None
+    marked_at: Optional[datetime] = None
+
+class AttendanceRoster(BaseModel):
+    session: Session
+    enrolled: int
+    marked: int
+    present: int
+    roster: List[AttendanceRosterEntry]
+
+class AttendanceMark(BaseModel):
+    trainee_id: int
+    present: bool
+
+class AttendanceBulkCreate(BaseModel):
+    session_id: int
+    records: List[AttendanceMark] = Field(..., min_length=1, max_length=1000)
+
 class AttendanceWithDetails(BaseModel):
     id: int
     session: Session
@@ -0,0 +1,166 @@
+import json
+from datetime import date, datetime
+from enum import Enum
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def json_default(obj):
+    """Encode the non-JSON types that show up in our payloads."""
+    if isinstance(obj, datetime) and obj.utcoffset() is not None and not obj.utcoffset():
+        # Match pydantic and orjson's OPT_UTC_Z: UTC as "Z"
+        return obj.replace(tzinfo=None).isoformat() + "Z"
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_json(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(obj, default=json_default, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_msgpack(obj) -> bytes:
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(obj, default=json_default)
+
+
+class EncodedMessage:
+    """A message encoded at most once per wire protocol.
+
+    Broadcasting the same EncodedMessage to many sockets costs one
+    encoding per protocol in use rather than one per socket.
+    """
+
+    __slots__ = ("payload", "_text", "_msgpack")
+
+    def __init__(self, payload):
+        self.payload = payload
+        self._text = None
+        self._msgpack = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = dumps_json(self.payload).decode("utf-8")
+        return self._text
+
+    @property
+    def msgpack(self) -> bytes:
+        if self._msgpack is None:
+            self._msgpack = dumps_msgpack(self.payload)
+        return self._msgpack
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps_json (orjson when installed).
+
+    Endpoints return it with already-projected content, which skips FastAPI's
+    response_model validation and jsonable_encoder pass.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps_json(content)
+
+
+# Direct ORM -> dict projections. They produce the same shape as
+# schemas.User and schemas.SessionWithTrainees without a pydantic round trip.
+def user_to_dict(user) -> dict:
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "role": user.role.value,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "is_temporary_password": user.is_temporary_password,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at,
+        "name": f"{user.first_name} {user.last_name}",
+    }
+
+
+def session_to_dict(session, trainees=None) -> dict:
+    """Project a Session; ``trainees`` defaults to its loaded enrolments."""
+    if trainees is None:
+        trainees = [st.trainee for st in session.trainees]
+    return {
+        "id": session.id,
+        "title": session.title,
+        "description": session.description,
+        "trainer_id": session.trainer_id,
+        "trainees": [user_to_dict(trainee) for trainee in trainees],
+        "scheduled_date": session.scheduled_date,
+        "duration_minutes": session.duration_minutes,
+        "status": session.status.value,
+        "class_link": session.class_link,
+        "session_link": session.session_link,
+        "created_at": session.created_at,
+        "updated_at": session.updated_at,
+    }
+
+
+def session_summary_dict(session, trainee_ids) -> dict:
+    """Match schemas.Session, whose ``trainees`` are ids."""
+    return {
+        "id": session.id,
+        "title": session.title,
+        "description": session.description,
+        "trainer_id": session.trainer_id,
+        "trainees": list(trainee_ids),
+        "scheduled_date": session.scheduled_date,
+        "duration_minutes": session.duration_minutes,
+        "status": session.status.value,
+        "class_link": session.class_link,
+        "session_link": session.session_link,
+        "created_at": session.created_at,
+        "updated_at": session.updated_at,
+    }
+
+
+def session_export_dict(session) -> dict:
+    """Flat session row for exports: trainee ids instead of nested users."""
+    return {
+        "id": session.id,
+        "title": session.title,
+        "description": session.description,
+        "trainer_id": session.trainer_id,
+        "trainee_ids": [st.trainee_id for st in session.trainees],
+        "scheduled_date": session.scheduled_date,
+        "duration_minutes": session.duration_minutes,
+        "status": session.status.value,
+        "class_link": session.class_link,
+        "session_link": session.session_link,
+        "created_at": session.created_at,
+        "updated_at": session.updated_at,
+    }
+
+
+def attendance_to_dict(record) -> dict:
+    return {
+        "id": record.id,
+        "session_id": record.session_id,
+        "trainee_id": record.trainee_id,
+        "present": record.present,
+        "marked_at": record.marked_at,
+    }
@@ -0,0 +1,17 @@
+-- Migration: Add analytics_rollups table for persisted time-series buckets
+-- Date: 2026-10-16
+
+-- Create analytics_rollups table
+CREATE TABLE IF NOT EXISTS analytics_rollups (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    metric VARCHAR(50) NOT NULL,
+    granularity VARCHAR(10) NOT NULL,
+    bucket_start DATE NOT NULL,
+    dimension VARCHAR(50) NOT NULL,
+    value BIGINT NOT NULL DEFAULT 0,
+    computed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY unique_analytics_rollup (metric, granularity, bucket_start, dimension)
+);
+
+-- Bucket queries range-scan these columns
+CREATE INDEX idx_attendance_marked_at ON attendance (marked_at);
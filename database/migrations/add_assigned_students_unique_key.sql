@@ -0,0 +1,13 @@
+-- Migration: Make (student_id, teacher_id) unique in assigned_students
+-- Date: 2026-10-16
+
+-- Remove duplicate pairs, keeping the earliest assignment
+DELETE a1 FROM assigned_students a1
+JOIN assigned_students a2
+  ON a1.student_id = a2.student_id
+ AND a1.teacher_id = a2.teacher_id
+ AND a1.id > a2.id;
+
+-- Add the unique key used for duplicate-safe bulk inserts
+ALTER TABLE assigned_students
+ADD UNIQUE KEY unique_student_teacher (student_id, teacher_id);
@@ -0,0 +1,5 @@
+-- Migration: Add (updated_at, id) indexes backing the incremental user and session exports
+-- Date: 2026-10-16
+
+CREATE INDEX idx_users_updated_id ON users (updated_at, id);
+CREATE INDEX idx_sessions_updated_id ON sessions (updated_at, id);
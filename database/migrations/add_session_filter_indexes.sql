@@ -0,0 +1,5 @@
+-- Migration: Add composite indexes backing /sessions/ date, status and trainer filters
+-- Date: 2026-10-16
+
+CREATE INDEX idx_sessions_trainer_scheduled ON sessions (trainer_id, scheduled_date);
+CREATE INDEX idx_sessions_status_scheduled ON sessions (status, scheduled_date);
@@ -0,0 +1,23 @@
+-- Migration: Add trainee_progress summary table and populate it
+-- Date: 2026-10-16
+
+-- Create trainee_progress table
+CREATE TABLE IF NOT EXISTS trainee_progress (
+    trainee_id INT PRIMARY KEY,
+    total_sessions INT NOT NULL DEFAULT 0,
+    attended_sessions INT NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (trainee_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Populate from existing enrolments and attendance
+-- (scripts/rebuild_trainee_progress.py does the same and can be rerun at any time)
+INSERT INTO trainee_progress (trainee_id, total_sessions, attended_sessions)
+SELECT u.id,
+       (SELECT COUNT(*) FROM session_trainees st WHERE st.trainee_id = u.id),
+       (SELECT COUNT(*) FROM attendance a WHERE a.trainee_id = u.id AND a.present = TRUE)
+FROM users u
+WHERE u.role = 'trainee'
+ON DUPLICATE KEY UPDATE
+    total_sessions = VALUES(total_sessions),
+    attended_sessions = VALUES(attended_sessions);
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Boolean, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Date, DateTime, Enum, ForeignKey, Boolean, UniqueConstraint, Index, BigInteger
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import datetime, timezone
@@ -33,6 +33,11 @@ class User(Base):
     # Relationships
     sessions_as_trainer = relationship("Session", back_populates="trainer", foreign_keys="Session.trainer_id")
 
+    __table_args__ = (
+        # Keyset batches of the incremental export (crud.stream_users)
+        Index('idx_users_updated_id', 'updated_at', 'id'),
+    )
+
     @hybrid_property
     def name(self):
         return f"{self.first_name} {self.last_name}"
@@ -57,6 +62,15 @@ class Session(Base):
     trainees = relationship("SessionTrainee", back_populates="session")
     attendance_records = relationship("Attendance", back_populates="session")
 
+    __table_args__ = (
+        # Calendar/list filters: a trainer's sessions in a date window, and
+        # sessions of one status in a date window
+        Index('idx_sessions_trainer_scheduled', 'trainer_id', 'scheduled_date'),
+        Index('idx_sessions_status_scheduled', 'status', 'scheduled_date'),
+        # Keyset batches of the incremental export (crud.stream_sessions)
+        Index('idx_sessions_updated_id', 'updated_at', 'id'),
+    )
+
 class SessionTrainee(Base):
     __tablename__ = "session_trainees"
 
@@ -95,6 +109,46 @@ class AssignedStudent(Base):
     student = relationship("User", foreign_keys=[student_id])
     teacher = relationship("User", foreign_keys=[teacher_id])
 
+    __table_args__ = (
+        UniqueConstraint('student_id', 'teacher_id', name='unique_student_teacher'),
+    )
+
+class TraineeProgress(Base):
+    """Per-trainee enrolment and attendance counts.
+
+    Kept current by the crud write functions; see refresh_trainee_progress
+    and scripts/rebuild_trainee_progress.py for recomputing it.
+    """
+    __tablename__ = "trainee_progress"
+
+    trainee_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_sessions = Column(Integer, nullable=False, default=0)
+    attended_sessions = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    # Relationships
+    trainee = relationship("User")
+
+class AnalyticsRollup(Base):
+    """One persisted value of a closed analytics time bucket.
+
+    ``dimension`` is e.g. a session status or trainer id; every computed
+    bucket has a "total" row, so empty buckets are stored too.
+    """
+    __tablename__ = "analytics_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    metric = Column(String(50), nullable=False)  # 'sessions', 'training_minutes', 'attendance'
+    granularity = Column(String(10), nullable=False)  # 'day', 'week', 'month'
+    bucket_start = Column(Date, nullable=False)
+    dimension = Column(String(50), nullable=False)
+    value = Column(BigInteger, nullable=False, default=0)
+    computed_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('metric', 'granularity', 'bucket_start', 'dimension', name='unique_analytics_rollup'),
+    )
+
 class Attendance(Base):
     __tablename__ = "attendance"
 
@@ -110,4 +164,6 @@ class Attendance(Base):
 
     __table_args__ = (
         UniqueConstraint('session_id', 'trainee_id', name='unique_session_trainee_attendance'),
+        # Time-bucketed attendance rollups range-scan marked_at
+        Index('idx_attendance_marked_at', 'marked_at'),
     )
@@ -237,6 +237,7 @@ export function AuthProvider({ children }) {
           }).filter(Boolean));
           break;
         case 'student_assigned':
+        case 'students_assigned':
         case 'student_unassigned':
           // Fetch updated assignments
           fetch(`${API_BASE_URL}/assignments/`, { headers: authHeaders() })
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark cohort analytics on synthetic data.
+
+Builds random enrolment, attendance and assignment columns, then times the
+vectorised NumPy report (backend/cohorts.py) against an equivalent
+per-trainee Python loop over the same rows. No database is needed.
+
+Usage:
+    python scripts/benchmark_cohorts.py [--trainees 50000] [--trainers 500] [--sessions-per-trainee 40] [--weeks 12]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+
+# Add the project root to sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from backend import cohorts
+
+WEEK = cohorts.WEEK_SECONDS
+
+
+def build_data(n_trainees: int, n_trainers: int, per_trainee: int, now: float, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    trainee_ids = np.arange(1, n_trainees + 1) + n_trainers
+    enrolled = np.repeat(trainee_ids, rng.poisson(per_trainee, n_trainees))
+    marked = rng.random(enrolled.size) < 0.9
+    attendance_trainee = enrolled[marked]
+    attendance_present = rng.random(attendance_trainee.size) < 0.75
+    attendance_time = now - rng.random(attendance_trainee.size) * 52 * WEEK
+    assigned_trainee = trainee_ids
+    assigned_trainer = rng.integers(1, n_trainers + 1, n_trainees)
+    assigned_time = now - rng.random(n_trainees) * 52 * WEEK
+    return cohorts.CohortArrays(
+        enrolled, attendance_trainee, attendance_present, attendance_time,
+        assigned_trainee, assigned_trainer, assigned_time,
+    )
+
+
+def percentile(sorted_values, q):
+    position = (len(sorted_values) - 1) * q / 100
+    lower, upper = math.floor(position), math.ceil(position)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def row_by_row(rows, weeks: int, now: float):
+    """The same statistics computed one row and one trainee at a time."""
+    enrolled, attendance, assignments = rows
+    enrolled_count = defaultdict(int)
+    for trainee_id in enrolled:
+        enrolled_count[trainee_id] += 1
+    present_count = defaultdict(int)
+    last_present = {}
+    for trainee_id, present, scheduled in attendance:
+        if present:
+            present_count[trainee_id] += 1
+            last_present[trainee_id] = max(last_present.get(trainee_id, -math.inf), scheduled)
+    rates = {t: present_count[t] / n * 100 for t, n in enrolled_count.items()}
+    overall = sorted(rates.values())
+    summary = [percentile(overall, q) for q in cohorts.PERCENTILES]
+
+    by_trainer = defaultdict(list)
+    first_assigned = {}
+    for trainee_id, trainer_id, assigned in assignments:
+        if trainee_id in rates:
+            by_trainer[trainer_id].append(rates[trainee_id])
+        first_assigned[trainee_id] = min(first_assigned.get(trainee_id, math.inf), assigned)
+    trainers = {}
+    for trainer_id, values in by_trainer.items():
+        values.sort()
+        trainers[trainer_id] = [percentile(values, q) for q in cohorts.PERCENTILES]
+
+    retention = []
+    for week in range(weeks + 1):
+        eligible = retained = 0
+        for trainee_id, start in first_assigned.items():
+            if (now - start) // WEEK >= week:
+                eligible += 1
+                last = last_present.get(trainee_id, -math.inf)
+                if last >= start and (last - start) // WEEK >= week:
+                    retained += 1
+        retention.append((eligible, retained))
+    return summary, trainers, retention
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trainees", type=int, default=50000)
+    parser.add_argument("--trainers", type=int, default=500)
+    parser.add_argument("--sessions-per-trainee", type=int, default=40)
+    parser.add_argument("--weeks", type=int, default=12)
+    args = parser.parse_args()
+
+    now = time.time()
+    data = build_data(args.trainees, args.trainers, args.sessions_per_trainee, now)
+    rows = (
+        data.enrolled_trainee.tolist(),
+        list(zip(data.attendance_trainee.tolist(), data.attendance_present.tolist(), data.attendance_time.tolist())),
+        list(zip(data.assigned_trainee.tolist(), data.assigned_trainer.tolist(), data.assigned_time.tolist())),
+    )
+
+    started = time.perf_counter()
+    report = cohorts.cohort_report(data, retention_weeks=args.weeks, now=now)
+    vectorised = time.perf_counter() - started
+
+    started = time.perf_counter()
+    summary, trainers, retention = row_by_row(rows, args.weeks, now)
+    looped = time.perf_counter() - started
+
+    assert [(r["eligible"], r["retained"]) for r in report["retention"]] == retention
+    assert all(abs(report["attendance_rate"][f"p{q}"] - round(v, 2)) < 1e-6 for q, v in zip(cohorts.PERCENTILES, summary))
+    assert len(report["trainers"]) == len(trainers)
+
+    print(f"{args.trainees} trainees, {args.trainers} trainers, "
+          f"{data.enrolled_trainee.size} enrolments, {data.attendance_trainee.size} attendance rows")
+    print(f"  row by row:  {looped * 1000:8.1f} ms")
+    print(f"  vectorised:  {vectorised * 1000:8.1f} ms")
+    print(f"  speedup:     {looped / vectorised:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
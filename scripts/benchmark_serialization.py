@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark /sessions/ response serialization.
+
+Compares the previous path (ORM __dict__ -> response_model validation ->
+json.dumps, as FastAPI does for a plain return value) with the fast path
+(session_to_dict projection -> FastJSONResponse) on in-memory sessions.
+No database is needed.
+
+Usage:
+    python scripts/benchmark_serialization.py [--sessions 10000] [--trainees 5] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+# Add the project root to sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from pydantic import TypeAdapter
+
+from database import models
+from backend import schemas
+from backend.serialization import FastJSONResponse, session_to_dict
+
+
+def build_sessions(n_sessions: int, n_trainees: int):
+    now = datetime.now(timezone.utc)
+    trainees = [
+        models.User(
+            id=i,
+            username=f"trainee{i}",
+            email=f"trainee{i}@example.com",
+            password_hash="x",
+            role=models.UserRole.trainee,
+            first_name="Trainee",
+            last_name=str(i),
+            is_temporary_password=False,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(1, 501)
+    ]
+    sessions = []
+    for i in range(1, n_sessions + 1):
+        session = models.Session(
+            id=i,
+            title=f"Session {i}",
+            description="Benchmark session",
+            trainer_id=1,
+            scheduled_date=now + timedelta(hours=i),
+            duration_minutes=60,
+            status=models.SessionStatus.scheduled,
+            class_link="https://example.com/class",
+            session_link=f"link-{i}",
+            created_at=now,
+            updated_at=now,
+        )
+        session.trainees = [
+            models.SessionTrainee(session_id=i, trainee=trainees[(i + j) % len(trainees)])
+            for j in range(n_trainees)
+        ]
+        sessions.append(session)
+    return sessions
+
+
+def previous_path(sessions, adapter):
+    result = [{**s.__dict__, 'trainees': [st.trainee for st in s.trainees]} for s in sessions]
+    validated = adapter.validate_python(result, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(sessions):
+    return FastJSONResponse([session_to_dict(s) for s in sessions]).body
+
+
+def best_of(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--trainees", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sessions = build_sessions(args.sessions, args.trainees)
+    adapter = TypeAdapter(List[schemas.SessionWithTrainees])
+
+    old_time, old_size = best_of(lambda: previous_path(sessions, adapter), args.repeat)
+    new_time, new_size = best_of(lambda: fast_path(sessions), args.repeat)
+
+    print(f"{args.sessions} sessions x {args.trainees} trainees (best of {args.repeat})")
+    print(f"  previous path: {old_time * 1000:8.1f} ms  ({old_size} bytes)")
+    print(f"  fast path:     {new_time * 1000:8.1f} ms  ({new_size} bytes)")
+    print(f"  speedup:       {old_time / new_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
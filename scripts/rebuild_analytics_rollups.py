@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Drop persisted analytics time-series buckets so they are recomputed.
+
+Closed buckets are stored once in analytics_rollups and not revisited.
+Run this after backfilling or editing historical sessions or attendance;
+the next /analytics/timeseries request recomputes what it needs.
+
+Usage:
+    python scripts/rebuild_analytics_rollups.py [--since YYYY-MM-DD]
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+
+# Add the project root to sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.database import SessionLocal
+from backend import crud
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=date.fromisoformat, help="Only drop buckets starting on or after this date")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        deleted = crud.delete_analytics_rollups(db, since=args.since)
+        print(f"Dropped {deleted} persisted rollup rows.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
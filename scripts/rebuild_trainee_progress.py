@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Rebuild the trainee_progress summary table from session_trainees and attendance.
+
+The table is maintained incrementally by the API; run this after restoring
+data, running manual SQL, or whenever the counts are suspected to have drifted.
+
+Usage:
+    python scripts/rebuild_trainee_progress.py [--trainee ID ...]
+"""
+
+import argparse
+import os
+import sys
+
+# Add the project root to sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.database import SessionLocal, engine
+from database import models
+from backend import crud
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trainee", type=int, action="append", dest="trainee_ids",
+                        help="Only recount this trainee (may be repeated)")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine, tables=[models.TraineeProgress.__table__])
+    db = SessionLocal()
+    try:
+        written = crud.refresh_trainee_progress(db, args.trainee_ids)
+        db.commit()
+        print(f"Rebuilt trainee_progress: {written} rows written.")
+    except Exception as e:
+        db.rollback()
+        print(f"Rebuild failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()